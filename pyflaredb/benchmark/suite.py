@@ -1,60 +1,77 @@
 import time
-from typing import List, Dict, Any
-import random
+from typing import List, Dict, Any, Iterable, Optional, Sequence
 import string
+import numpy as np
 from ..core import PyFlareDB
 
+_ALPHABET = np.frombuffer((string.ascii_letters + string.digits).encode(), dtype="u1")
+
 
 class BenchmarkSuite:
-    def __init__(self, db: PyFlareDB):
+    BATCH_SIZE = 1000
+
+    def __init__(self, db: PyFlareDB, seed: Optional[int] = None):
         self.db = db
+        self.rng = np.random.default_rng(seed)  # Seeded for reproducible records and lookups
+
+    def run_benchmark(
+        self, num_records: int = 10000, data: Optional[Iterable[Dict[str, Sequence[Any]]]] = None
+    ):
+        """Run comprehensive benchmark
 
-    def run_benchmark(self, num_records: int = 10000):
-        """Run comprehensive benchmark"""
+        If data (batches of users records, as one sequence of values per
+        column) is given, its batches are inserted one by one as they are
+        produced, instead of num_records freshly generated records.
+        """
         results = {
-            "insert": self._benchmark_insert(num_records),
+            "insert": self._benchmark_insert(num_records, data),
             "select": self._benchmark_select(num_records),
             "index": self._benchmark_index_performance(num_records),
             "complex_query": self._benchmark_complex_queries(num_records),
         }
         return results
 
-    def _benchmark_insert(self, num_records: int) -> Dict[str, float]:
-        start_time = time.time()
+    def _benchmark_insert(
+        self, num_records: int, data: Optional[Iterable[Dict[str, Sequence[Any]]]] = None
+    ) -> Dict[str, float]:
+        if data is None:
+            # Random records, generated as part of each timed batch
+            batches = (
+                (min(self.BATCH_SIZE, num_records - i), None)
+                for i in range(0, num_records, self.BATCH_SIZE)
+            )
+        else:
+            batches = ((len(next(iter(batch.values()))), batch) for batch in data)
+
+        # Given batches are produced between the timed inserts
         batch_times = []
-
-        for i in range(0, num_records, 1000):
+        inserted = 0
+        for size, batch in batches:
             batch_start = time.time()
-            self._insert_batch(min(1000, num_records - i))
+            self._insert_batch(size, batch)
             batch_times.append(time.time() - batch_start)
+            inserted += size
 
-        total_time = time.time() - start_time
+        total_time = sum(batch_times)
         return {
             "total_time": total_time,
-            "records_per_second": num_records / total_time,
-            "avg_batch_time": sum(batch_times) / len(batch_times),
+            "records_per_second": inserted / total_time,
+            "avg_batch_time": total_time / len(batch_times),
         }
 
-    def _insert_batch(self, size: int):
-        """Insert a batch of random records"""
+    def _insert_batch(self, size: int, columns: Optional[Dict[str, Sequence[Any]]] = None):
+        """Insert a batch of records, random ones unless columns are given"""
         tx_id = None
         try:
             tx_id = self.db.transaction_manager.begin_transaction()
 
-            for _ in range(size):
-                query = (
-                    "INSERT INTO users (id, username, email, age) "
-                    f"VALUES ('{self._random_string(10)}', "
-                    f"'{self._random_string(8)}', "
-                    f"'{self._random_string(8)}@example.com', "
-                    f"{random.randint(18, 80)})"
-                )
-                try:
-                    self.db.execute(query)
-                except Exception as e:
-                    print(f"Failed to insert record: {e}")
-                    print(f"Query was: {query}")
-                    raise
+            if columns is None:
+                columns = self._random_columns(size)
+            try:
+                self.db.bulk_insert_columnar("users", columns)
+            except Exception as e:
+                print(f"Failed to insert batch of {size} records: {e}")
+                raise
 
             self.db.transaction_manager.commit(tx_id)
 
@@ -119,7 +136,17 @@ class BenchmarkSuite:
 
         return results
 
+    def _random_columns(self, size: int) -> Dict[str, Sequence[Any]]:
+        """Columns of a batch of random users records"""
+        return {
+            "id": self._random_strings(size, 10, self.rng),
+            "username": self._random_strings(size, 8, self.rng),
+            "email": [f"{name}@example.com" for name in self._random_strings(size, 8, self.rng)],
+            "age": self.rng.integers(18, 81, size=size),
+        }
+
     @staticmethod
-    def _random_string(length: int) -> str:
-        """Generate a random string of specified length"""
-        return "".join(random.choices(string.ascii_letters + string.digits, k=length))
+    def _random_strings(n: int, length: int, rng: np.random.Generator) -> List[str]:
+        """Generate n random alphanumeric strings of specified length"""
+        idx = rng.integers(0, len(_ALPHABET), size=(n, length), dtype="u1")
+        return _ALPHABET[idx].view(f"S{length}").ravel().astype(str).tolist()
@@ -1,4 +1,5 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set
+import threading
 import time
 import hashlib
 from collections import OrderedDict
@@ -8,32 +9,70 @@ class QueryCache:
         self.capacity = capacity
         self.ttl = ttl
         self.cache = OrderedDict()
+        # Cached query hashes per table they read, for invalidating on writes
+        self._cache_by_table: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()  # Queries may run on several threads at once
     
-    def get(self, query: str) -> Optional[Any]:
-        """Get cached query result"""
-        query_hash = self._hash_query(query)
-        if query_hash in self.cache:
-            entry = self.cache[query_hash]
-            if time.time() - entry['timestamp'] < self.ttl:
-                self.cache.move_to_end(query_hash)
-                return entry['result']
-            else:
-                del self.cache[query_hash]
+    def get(self, query: str, normalize: bool = True) -> Optional[Any]:
+        """Get cached query result
+        
+        With normalize=False the key is hashed as given, for keys carrying
+        values whose whitespace is significant.
+        """
+        query_hash = self._hash_query(query, normalize)
+        with self._lock:
+            entry = self.cache.get(query_hash)
+            if entry is not None:
+                if time.time() - entry['timestamp'] < self.ttl:
+                    self.cache.move_to_end(query_hash)
+                    return entry['result']
+                else:
+                    self._untrack(query_hash, self.cache.pop(query_hash))
         return None
     
-    def set(self, query: str, result: Any):
-        """Cache query result"""
-        if len(self.cache) >= self.capacity:
-            self.cache.popitem(last=False)
-        
-        query_hash = self._hash_query(query)
-        self.cache[query_hash] = {
-            'result': result,
-            'timestamp': time.time()
-        }
+    def set(self, query: str, result: Any, table: Optional[str] = None,
+            normalize: bool = True):
+        """Cache query result, optionally recording the table it was read from"""
+        query_hash = self._hash_query(query, normalize)
+        with self._lock:
+            if query_hash in self.cache:
+                self.cache.move_to_end(query_hash)
+                self._untrack(query_hash, self.cache[query_hash])
+            elif len(self.cache) >= self.capacity:
+                self._untrack(*self.cache.popitem(last=False))
+            
+            self.cache[query_hash] = {
+                'result': result,
+                'timestamp': time.time(),
+                'table': table
+            }
+            if table is not None:
+                self._cache_by_table.setdefault(table, set()).add(query_hash)
+    
+    def invalidate_table(self, table: str):
+        """Evict the cached results read from a table"""
+        with self._lock:
+            for query_hash in self._cache_by_table.pop(table, ()):
+                self.cache.pop(query_hash, None)
+    
+    def _untrack(self, query_hash: int, entry: Dict[str, Any]):
+        """Forget the table dependency of an entry leaving the cache"""
+        table = entry['table']
+        query_hashes = self._cache_by_table.get(table)
+        if query_hashes is not None:
+            query_hashes.discard(query_hash)
+            if not query_hashes:
+                del self._cache_by_table[table]
     
-    def _hash_query(self, query: str) -> str:
-        return hashlib.sha256(query.encode()).hexdigest()
+    def _hash_query(self, query: str, normalize: bool = True) -> int:
+        # Collapse whitespace so formatting variants share an entry, and key on
+        # a 64-bit integer digest which is cheaper to hash than a hex string
+        normalized = ' '.join(query.split()) if normalize else query
+        return int.from_bytes(
+            hashlib.blake2b(normalized.encode(), digest_size=8).digest(), 'little'
+        )
     
     def clear(self):
-        self.cache.clear()
\ No newline at end of file
+        with self._lock:
+            self.cache.clear()
+            self._cache_by_table.clear()
\ No newline at end of file
@@ -1,10 +1,33 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Sequence, Tuple
+import re
+import threading
 from .table import Table
 from .sql.parser import SQLParser, SelectStatement, InsertStatement
 from .sql.executor import QueryExecutor
 from .sql.optimizer import QueryOptimizer
 from .sql.statistics import TableStatistics
 from .transaction import TransactionManager
+from .cache.query_cache import QueryCache
+
+# Quoted strings and numbers; a LIMIT count is kept as part of the query shape.
+# The single capture group makes re.split() return literals at odd positions.
+_LITERAL_RE = re.compile(
+    r"('[^']*'|\"[^\"]*\"|(?<![\w.])(?<!LIMIT )-?\d+(?:\.\d+)?(?![\w.]))",
+    re.IGNORECASE,
+)
+# Plan cache entry for query shapes whose literals cannot be re-bound
+_UNCACHEABLE = object()
+
+
+def _bind_parameter(value: Any) -> Any:
+    """Value a bound INSERT parameter is stored as
+
+    Parameters are stored as values and never parsed as SQL. Strings get the
+    quotes the parser keeps on string literals, so they compare like them.
+    """
+    if isinstance(value, str):
+        return f"'{value}'"
+    return value
 
 
 class PyFlareDB:
@@ -17,7 +40,12 @@ class PyFlareDB:
         self.optimizer = QueryOptimizer(self.tables, self.statistics)
         self.executor = QueryExecutor(self.tables)
         self.transaction_manager = TransactionManager()
-        self._query_cache = {}
+        self._query_cache = QueryCache(capacity=1024, ttl=60)
+        self._plan_cache: Dict[str, Any] = {}
+        self._plan_cache_size = 1024
+        # Statements run one at a time, so no thread reads the column store
+        # while another one is appending to it
+        self._lock = threading.RLock()
 
     def begin_transaction(self) -> str:
         """Begin a new transaction"""
@@ -37,54 +65,319 @@ class PyFlareDB:
             raise ValueError(f"Table {table.name} already exists")
         self.tables[table.name] = table
         self.statistics.collect_statistics(table)
+        self._query_cache.invalidate_table(table.name)
 
     def drop_table(self, table_name: str) -> None:
         """Drop a table"""
         if table_name not in self.tables:
             raise ValueError(f"Table {table_name} does not exist")
         del self.tables[table_name]
+        self._query_cache.invalidate_table(table_name)
+
+    def bulk_insert(
+        self, table_name: str, columns: List[str], rows: Iterable[Sequence[Any]]
+    ) -> bool:
+        """Insert many rows at once, bypassing the SQL parser"""
+        if table_name not in self.tables:
+            raise ValueError(f"Table {table_name} does not exist")
+
+        table = self.tables[table_name]
+
+        # Validate the column list once for the whole batch
+        for col_name in columns:
+            if col_name not in table._column_by_name:
+                raise ValueError(f"Column {col_name} does not exist")
+
+        batch = []
+        for row in rows:
+            if len(row) != len(columns):
+                raise ValueError(
+                    f"Column count ({len(columns)}) doesn't match value count ({len(row)})"
+                )
+            batch.append(dict(zip(columns, row)))
+
+        # Type conversion and constraint checks happen in Table.batch_insert
+        with self._lock:
+            result = table.batch_insert(batch)
+            self._query_cache.invalidate_table(table_name)
+        return result
+
+    def bulk_insert_columnar(
+        self, table_name: str, columns: Dict[str, Sequence[Any]]
+    ) -> bool:
+        """Insert a batch given as one sequence (or NumPy array) of values per column"""
+        if table_name not in self.tables:
+            raise ValueError(f"Table {table_name} does not exist")
+
+        with self._lock:
+            result = self.tables[table_name].batch_insert_columnar(columns)
+            self._query_cache.invalidate_table(table_name)
+        return result
 
     def execute(
-        self, sql: str, tx_id: Optional[str] = None
+        self, sql: str, tx_id: Optional[str] = None, params: Optional[Sequence[Any]] = None
     ) -> Optional[List[Dict[str, Any]]]:
-        """Execute a SQL query"""
-        try:
-            # Check query cache for non-transactional SELECT queries
-            if tx_id is None and sql in self._query_cache:
-                return self._query_cache[sql]
-
-            # Parse SQL
-            if sql.strip().upper().startswith("SELECT"):
-                statement = self.parser.parse_select(sql)
-            elif sql.strip().upper().startswith("INSERT"):
-                statement = self.parser.parse_insert(sql)
-            else:
-                raise ValueError("Unsupported SQL statement type")
+        """Execute a SQL query, binding params to its ? placeholders if given"""
+        if params is not None:
+            # Bound values are never escaped into the query text or re-parsed
+            return self.prepare(sql).execute(params, tx_id)
 
-            # Get transaction if provided
-            tx = None
-            if tx_id:
-                tx = self.transaction_manager.get_transaction(tx_id)
-                if not tx:
-                    raise ValueError(f"Transaction {tx_id} does not exist")
+        # Check query cache for non-transactional SELECT queries
+        if tx_id is None:
+            cached = self._query_cache.get(sql)
+            if cached is not None:
+                return cached
 
-            # Optimize query plan
-            optimized_plan = self.optimizer.optimize(statement)
+        # Parse and optimize, reusing the plan of queries with the same shape
+        optimized_plan = self._get_plan(sql)
+        return self._execute_plan(optimized_plan, tx_id, sql)
 
+    def _execute_plan(
+        self, optimized_plan, tx_id: Optional[str], cache_key: str,
+        normalize_key: bool = True
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Execute an optimized plan, caching SELECT results under cache_key"""
+        # Get transaction if provided
+        tx = None
+        if tx_id:
+            tx = self.transaction_manager.get_transaction(tx_id)
+            if not tx:
+                raise ValueError(f"Transaction {tx_id} does not exist")
+
+        with self._lock:
             # Execute query
             result = self.executor.execute(optimized_plan, transaction=tx)
 
-            # Cache SELECT results for non-transactional queries
-            if tx_id is None and isinstance(statement, SelectStatement):
-                self._query_cache[sql] = result
+            if isinstance(optimized_plan, SelectStatement):
+                # Cache SELECT results for non-transactional queries
+                if tx_id is None:
+                    self._query_cache.set(
+                        cache_key, result, table=optimized_plan.table_name,
+                        normalize=normalize_key
+                    )
+            else:
+                # Writes make cached SELECT results of the written table stale
+                self._query_cache.invalidate_table(optimized_plan.table_name)
+
+        return result
+
+    def prepare(self, sql: str) -> "PreparedStatement":
+        """Parse and optimize a query with ? placeholders for repeated execution"""
+        plan = self._get_template_plan(" ".join(sql.split()))
+        if plan is _UNCACHEABLE:
+            raise ValueError(f"Cannot bind parameters of query: {sql}")
+        return PreparedStatement(self, sql, plan)
+
+    def executemany(
+        self, sql: str, seq_of_params: Iterable[Sequence[Any]], tx_id: Optional[str] = None
+    ) -> bool:
+        """Execute an INSERT with ? placeholders once per parameter sequence"""
+        return self.prepare(sql).executemany(seq_of_params, tx_id)
+
+    def _parse(self, sql: str):
+        """Parse a SQL statement"""
+        if sql.strip().upper().startswith("SELECT"):
+            return self.parser.parse_select(sql)
+        elif sql.strip().upper().startswith("INSERT"):
+            return self.parser.parse_insert(sql)
+        raise ValueError("Unsupported SQL statement type")
+
+    def _get_plan(self, sql: str):
+        """Return the optimized plan for a query
+
+        Literals are stripped from the query to get its shape; the plan of the
+        shape is parsed and optimized once and the literals are bound into it.
+        """
+        # A bare ? would be mistaken for a placeholder
+        if "?" not in sql:
+            template, literals = self._normalize(sql)
+            template_plan = self._get_template_plan(template)
+            if template_plan is not _UNCACHEABLE:
+                return self._bind_plan(template_plan, literals)
+
+        return self.optimizer.optimize(self._parse(sql))
 
-            return result
+    def _get_template_plan(self, template: str):
+        """Plan of a query shape from the plan cache, prepared on a miss"""
+        template_plan = self._plan_cache.get(template)
+        if template_plan is None:
+            template_plan = self._prepare_template(template)
+            with self._lock:
+                if len(self._plan_cache) >= self._plan_cache_size:
+                    del self._plan_cache[next(iter(self._plan_cache))]
+                self._plan_cache[template] = template_plan
+        return template_plan
 
-        except Exception as e:
-            # Clear cache on error
-            self._query_cache.clear()
-            raise e
+    @staticmethod
+    def _normalize(sql: str) -> Tuple[str, List[str]]:
+        """Replace the literals of a query with ? and return them in order"""
+        # Collapse whitespace first, as the parser does
+        parts = _LITERAL_RE.split(" ".join(sql.split()))
+        return "?".join(parts[0::2]), parts[1::2]
+
+    def _prepare_template(self, template: str):
+        """Parse and optimize a query shape, or return _UNCACHEABLE"""
+        try:
+            plan = self.optimizer.optimize(self._parse(template))
+        except ValueError:
+            return _UNCACHEABLE
+
+        # Every placeholder has to land somewhere it can be bound again
+        placeholders = template.count("?")
+        if isinstance(plan, SelectStatement):
+            if (plan.where_clause or "").count("?") == placeholders:
+                return plan
+        elif isinstance(plan, InsertStatement):
+            if sum(1 for value in plan.values if value == "?") == placeholders:
+                return plan
+        return _UNCACHEABLE
+
+    def _bind_plan(self, plan, literals: List[str]):
+        """Substitute literals for the placeholders of a template plan"""
+        if not literals:
+            return plan
+
+        if isinstance(plan, SelectStatement):
+            parts = plan.where_clause.split("?")
+            where_clause = parts[0] + "".join(
+                literal + part for literal, part in zip(literals, parts[1:])
+            )
+            return SelectStatement(
+                plan.table_name,
+                plan.columns,
+                where_clause,
+                plan.group_by,
+                plan.order_by,
+                plan.limit,
+            )
+
+        remaining = iter(literals)
+        parse_value = self.parser.parse_value
+        values = tuple(
+            parse_value(next(remaining)) if value == "?" else value
+            for value in plan.values
+        )
+        return InsertStatement(plan.table_name, plan.columns, values)
 
     def clear_cache(self) -> None:
         """Clear the query cache"""
         self._query_cache.clear()
+
+    def clear_caches(self) -> None:
+        """Clear the query cache, the plan cache and the parsers' statement caches
+
+        Also drops the WHERE predicates each table compiled, so that queries
+        run afterwards start out fully cold.
+        """
+        self._query_cache.clear()
+        with self._lock:
+            self._plan_cache.clear()
+            for table in self.tables.values():
+                table._compiled_conditions.clear()
+        SQLParser.clear_cache()
+        Table._parse_where.cache_clear()
+
+
+class PreparedStatement:
+    """A query parsed and optimized once, executed with ? parameters bound in order"""
+
+    def __init__(self, db: PyFlareDB, sql: str, plan):
+        self.sql = sql
+        # Only the statement text is normalized; parameter values are keyed verbatim
+        self._cache_prefix = " ".join(sql.split()) + "\0"
+        self._db = db
+        self._plan = plan
+        if isinstance(plan, InsertStatement):
+            self._placeholders = [i for i, value in enumerate(plan.values) if value == "?"]
+            self.parameter_count = len(self._placeholders)
+            return
+
+        where_clause = plan.where_clause or ""
+        self.parameter_count = 0
+        if "?" in where_clause:
+            # Every ? has to be the value of a condition to have a slot to bind into
+            try:
+                self.parameter_count = Table._placeholder_count(where_clause)
+            except ValueError:
+                self.parameter_count = -1
+            if self.parameter_count != where_clause.count("?"):
+                raise ValueError(f"Cannot bind parameters of query: {sql}")
+
+        table = db.tables.get(plan.table_name)
+        if table is not None and where_clause:
+            # Compile the predicate once; executions only bind values to it
+            try:
+                table._compiled_where(where_clause)
+            except ValueError:
+                pass
+
+    def execute(
+        self, params: Sequence[Any] = (), tx_id: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Execute the statement with one parameter sequence"""
+        plan = self._bind(params)
+        # Results of a SELECT are cached per statement and parameter values
+        cache_key = f"{self._cache_prefix}{tuple(params)!r}"
+        if tx_id is None and isinstance(plan, SelectStatement):
+            cached = self._db._query_cache.get(cache_key, normalize=False)
+            if cached is not None:
+                return cached
+        return self._db._execute_plan(plan, tx_id, cache_key, normalize_key=False)
+
+    def executemany(
+        self, seq_of_params: Iterable[Sequence[Any]], tx_id: Optional[str] = None
+    ) -> bool:
+        """Execute an INSERT once per parameter sequence
+
+        Outside a transaction all rows are inserted as a single batch.
+        """
+        plan = self._plan
+        if not isinstance(plan, InsertStatement):
+            raise ValueError("executemany only supports INSERT statements")
+
+        if tx_id is not None:
+            # Inserts inside a transaction are tracked one by one
+            for params in seq_of_params:
+                self.execute(params, tx_id)
+            return True
+
+        rows = [self._bind_values(params) for params in seq_of_params]
+        return self._db.bulk_insert(plan.table_name, list(plan.columns), rows)
+
+    def _bind(self, params: Sequence[Any]):
+        """Plan with the parameters bound to the placeholders
+
+        Parameters are carried as values next to the WHERE clause, so they are
+        never spliced into SQL text or parsed.
+        """
+        plan = self._plan
+        if isinstance(plan, InsertStatement):
+            return InsertStatement(
+                plan.table_name, plan.columns, tuple(self._bind_values(params))
+            )
+
+        self._check_count(params)
+        return SelectStatement(
+            plan.table_name,
+            plan.columns,
+            plan.where_clause,
+            plan.group_by,
+            plan.order_by,
+            plan.limit,
+            tuple(params),
+        )
+
+    def _bind_values(self, params: Sequence[Any]) -> List[Any]:
+        """INSERT values with the parameters substituted for the placeholders"""
+        self._check_count(params)
+        values = list(self._plan.values)
+        for i, param in zip(self._placeholders, params):
+            values[i] = _bind_parameter(param)
+        return values
+
+    def _check_count(self, params: Sequence[Any]) -> None:
+        """Reject a parameter sequence of the wrong length"""
+        if len(params) != self.parameter_count:
+            raise ValueError(
+                f"Expected {self.parameter_count} parameters, got {len(params)}"
+            )
@@ -1,21 +1,42 @@
-from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from collections import deque
+from bisect import bisect_left, bisect_right
+from functools import cmp_to_key
 
-@dataclass
 class Node:
-    keys: List[Any]
-    values: List[List[int]]  # List of row IDs for each key (handling duplicates)
-    children: List['Node']
-    is_leaf: bool = True
+    __slots__ = ('keys', 'values', 'children', 'is_leaf', 'next_leaf')
+    
+    def __init__(self, keys: List[Any], values: List[List[int]], children: List['Node'],
+                 is_leaf: bool = True, next_leaf: Optional['Node'] = None):
+        self.keys = keys
+        self.values = values  # List of row IDs for each key (handling duplicates), leaves only
+        self.children = children
+        self.is_leaf = is_leaf
+        self.next_leaf = next_leaf  # Right sibling, for scanning leaves in key order
+
+# Key types that compare natively among themselves
+_NATIVE_KEY_TYPES = (int, float, str)
+_MIXED_KEYS = object()
+
+
+def _cmp_native(key1: Any, key2: Any) -> int:
+    """Compare two keys of the same native type"""
+    return (key1 > key2) - (key1 < key2)
+
 
 class BTreeIndex:
     def __init__(self, order: int = 100):
         self.root = Node([], [], [])
         self.order = order  # Maximum number of children per node
+        # Comparator specialized to the key type seen so far
+        self._key_type = None
+        self._cmp = self._compare_keys
+        self._size = 0  # Number of (key, row ID) entries
     
     def insert(self, key: Any, row_id: int) -> None:
         """Insert a key-value pair into the B-tree"""
+        if type(key) is not self._key_type and self._key_type is not _MIXED_KEYS:
+            self._bind_comparator({type(key)})
         if len(self.root.keys) == (2 * self.order) - 1:
             # Split root if full
             new_root = Node([], [], [], False)
@@ -23,15 +44,154 @@ class BTreeIndex:
             self._split_child(new_root, 0)
             self.root = new_root
         self._insert_non_full(self.root, key, row_id)
+        self._size += 1
+    
+    def bulk_insert(self, keys: List[Any], row_ids: Iterable[int]) -> None:
+        """Insert a batch of keys with their row IDs
+        
+        A batch at least as large as the index is merged with the existing
+        entries and bulk-loaded, which keeps the rebuild cost amortized; smaller
+        batches are inserted one by one in key order.
+        """
+        pairs = list(zip(keys, row_ids))
+        if len(pairs) >= max(self.order, self._size):
+            self.bulk_load(self._pairs() + pairs)
+            return
+        
+        for key, row_id in self._sorted_pairs(pairs):
+            self.insert(key, row_id)
+    
+    def bulk_load(self, pairs: List[Tuple[Any, int]]) -> None:
+        """Build the index from scratch out of (key, row_id) pairs
+        
+        Builds packed leaves bottom-up from the sorted pairs, instead of
+        inserting keys one at a time.
+        """
+        pairs = self._sorted_pairs(pairs)
+        self._size = len(pairs)
+        
+        # The loaded tree replaces the current one, so start type tracking over
+        self._key_type = None
+        self._bind_comparator({type(key) for key, _ in pairs})
+        cmp = self._cmp
+        
+        # Group row IDs of duplicate keys
+        keys: List[Any] = []
+        values: List[List[int]] = []
+        for key, row_id in pairs:
+            if keys and cmp(key, keys[-1]) == 0:
+                values[-1].append(row_id)
+            else:
+                keys.append(key)
+                values.append([row_id])
+        
+        # Pack the leaves and chain them; leave headroom in each node so later
+        # inserts do not split straight away
+        capacity = max(self.order - 1, 1)
+        nodes = [
+            Node(keys[start:start + capacity], values[start:start + capacity], [])
+            for start in range(0, len(keys), capacity)
+        ] or [Node([], [], [])]
+        for leaf, next_leaf in zip(nodes, nodes[1:]):
+            leaf.next_leaf = next_leaf
+        
+        # Build internal levels until a single root remains
+        separators = [node.keys[0] for node in nodes[1:]]
+        while len(nodes) > 1:
+            nodes, separators = self._build_internal_level(separators, nodes)
+        self.root = nodes[0]
+    
+    def _sorted_pairs(self, pairs: List[Tuple[Any, int]]) -> List[Tuple[Any, int]]:
+        """Stable-sort (key, row_id) pairs by key"""
+        try:
+            return sorted(pairs, key=lambda pair: pair[0])
+        except TypeError:
+            # Mixed or None keys: sort with the generic comparison
+            return sorted(pairs, key=cmp_to_key(lambda a, b: self._compare_keys(a[0], b[0])))
+    
+    def _pairs(self) -> List[Tuple[Any, int]]:
+        """All (key, row_id) entries in key order, read off the leaf chain"""
+        node = self.root
+        while not node.is_leaf:
+            node = node.children[0]
+        
+        pairs = []
+        while node is not None:
+            for key, row_ids in zip(node.keys, node.values):
+                pairs.extend((key, row_id) for row_id in row_ids)
+            node = node.next_leaf
+        return pairs
+    
+    def _build_internal_level(self, keys: List[Any], children: List[Node]) -> Tuple[List[Node], List[Any]]:
+        """Pack separator keys and their children into one internal tree level
+        
+        Returns the nodes of the level and the separator keys that have to be
+        promoted into the level above.
+        """
+        capacity = max(self.order - 1, 1)
+        nodes = []
+        separators = []
+        
+        start = 0
+        while True:
+            end = start + capacity
+            if end + 1 >= len(keys):
+                # Not enough keys left for a separator and a non-empty sibling
+                end = len(keys)
+            nodes.append(Node(keys[start:end], [], children[start:end + 1], False))
+            if end == len(keys):
+                break
+            separators.append(keys[end])
+            start = end + 1
+        
+        return nodes, separators
+    
+    def _bind_comparator(self, key_types: Set[type]) -> None:
+        """Use the native comparator while every key shares a single native type"""
+        if not key_types:
+            return
+        if (self._key_type is None and len(key_types) == 1
+                and next(iter(key_types)) in _NATIVE_KEY_TYPES):
+            self._key_type = next(iter(key_types))
+            self._cmp = _cmp_native
+        elif key_types != {self._key_type}:
+            # None or mixed types: fall back to the generic comparison for good
+            self._key_type = _MIXED_KEYS
+            self._cmp = self._compare_keys
+    
+    def _comparator(self, *keys: Any) -> Callable[[Any, Any], int]:
+        """Comparator that is safe for the given lookup keys"""
+        for key in keys:
+            if type(key) is not self._key_type:
+                return self._compare_keys
+        return self._cmp
     
     def search(self, key: Any) -> List[int]:
         """Search for a key and return all matching row IDs"""
         return self._search_node(self.root, key)
     
     def range_search(self, start_key: Any, end_key: Any) -> List[int]:
-        """Perform a range search and return all matching row IDs"""
+        """Perform a range search and return all matching row IDs
+        
+        Both bounds are inclusive; None leaves that side of the range open.
+        """
+        # Descend once to the leaf where the range starts
+        node = self.root
+        while not node.is_leaf:
+            i = 0 if start_key is None else self._upper_bound(node.keys, start_key)
+            node = node.children[i]
+        i = 0 if start_key is None else self._lower_bound(node.keys, start_key)
+        
+        # Then walk the leaf chain until a key passes the end of the range
         result = []
-        self._range_search_node(self.root, start_key, end_key, result)
+        while node is not None:
+            end = len(node.keys) if end_key is None else self._upper_bound(node.keys, end_key)
+            for row_ids in node.values[i:end]:
+                result.extend(row_ids)
+            if end < len(node.keys):
+                break
+            node = node.next_leaf
+            i = 0
         return result
     
     def _split_child(self, parent: Node, child_index: int) -> None:
@@ -39,84 +199,83 @@ class BTreeIndex:
         order = self.order
         child = parent.children[child_index]
         new_node = Node([], [], [], child.is_leaf)
-        
-        # Move the median key to the parent
         median = order - 1
-        parent.keys.insert(child_index, child.keys[median])
-        parent.values.insert(child_index, child.values[median])
-        parent.children.insert(child_index + 1, new_node)
         
-        # Move half of the keys to the new node
-        new_node.keys = child.keys[median + 1:]
-        new_node.values = child.values[median + 1:]
-        child.keys = child.keys[:median]
-        child.values = child.values[:median]
-        
-        # Move children if not a leaf
-        if not child.is_leaf:
+        if child.is_leaf:
+            # Leaves keep every entry: move the upper half to the new leaf and
+            # copy its first key into the parent as the separator
+            new_node.keys = child.keys[median:]
+            new_node.values = child.values[median:]
+            child.keys = child.keys[:median]
+            child.values = child.values[:median]
+            new_node.next_leaf = child.next_leaf
+            child.next_leaf = new_node
+            parent.keys.insert(child_index, new_node.keys[0])
+        else:
+            # Move the median key to the parent and half of the keys and
+            # children to the new node
+            parent.keys.insert(child_index, child.keys[median])
+            new_node.keys = child.keys[median + 1:]
             new_node.children = child.children[median + 1:]
+            child.keys = child.keys[:median]
             child.children = child.children[:median + 1]
+        
+        parent.children.insert(child_index + 1, new_node)
     
     def _insert_non_full(self, node: Node, key: Any, row_id: int) -> None:
         """Insert into a non-full node"""
-        i = len(node.keys) - 1
+        cmp = self._cmp
+        max_keys = (2 * self.order) - 1
         
-        if node.is_leaf:
-            # Insert into leaf node
-            while i >= 0 and self._compare_keys(key, node.keys[i]) < 0:
-                i -= 1
-            i += 1
-            
-            # Handle duplicate keys
-            if i > 0 and self._compare_keys(key, node.keys[i-1]) == 0:
-                node.values[i-1].append(row_id)
-            else:
-                node.keys.insert(i, key)
-                node.values.insert(i, [row_id])
-        else:
-            # Find the child to insert into
-            while i >= 0 and self._compare_keys(key, node.keys[i]) < 0:
-                i -= 1
-            i += 1
-            
-            if len(node.children[i].keys) == (2 * self.order) - 1:
+        # Find the leaf to insert into, splitting full nodes on the way down
+        while not node.is_leaf:
+            i = self._upper_bound(node.keys, key)
+            if len(node.children[i].keys) == max_keys:
                 self._split_child(node, i)
-                if self._compare_keys(key, node.keys[i]) > 0:
+                if cmp(key, node.keys[i]) >= 0:
                     i += 1
-            
-            self._insert_non_full(node.children[i], key, row_id)
+            node = node.children[i]
+        
+        i = self._lower_bound(node.keys, key)
+        if i < len(node.keys) and cmp(key, node.keys[i]) == 0:
+            # Handle duplicate keys
+            node.values[i].append(row_id)
+        else:
+            node.keys.insert(i, key)
+            node.values.insert(i, [row_id])
     
     def _search_node(self, node: Node, key: Any) -> List[int]:
         """Search for a key in a node"""
-        i = 0
-        while i < len(node.keys) and self._compare_keys(key, node.keys[i]) > 0:
-            i += 1
+        cmp = self._comparator(key)
+        while not node.is_leaf:
+            node = node.children[self._upper_bound(node.keys, key)]
         
-        if i < len(node.keys) and self._compare_keys(key, node.keys[i]) == 0:
+        i = self._lower_bound(node.keys, key)
+        if i < len(node.keys) and cmp(key, node.keys[i]) == 0:
             return node.values[i]
-        elif node.is_leaf:
-            return []
-        else:
-            return self._search_node(node.children[i], key)
+        return []
     
-    def _range_search_node(self, node: Node, start_key: Any, end_key: Any, result: List[int]) -> None:
-        """Perform range search on a node"""
-        i = 0
-        while i < len(node.keys) and self._compare_keys(start_key, node.keys[i]) > 0:
-            i += 1
-        
-        if node.is_leaf:
-            while i < len(node.keys) and self._compare_keys(node.keys[i], end_key) <= 0:
-                result.extend(node.values[i])
-                i += 1
-        else:
-            if i < len(node.keys):
-                self._range_search_node(node.children[i], start_key, end_key, result)
-            while i < len(node.keys) and self._compare_keys(node.keys[i], end_key) <= 0:
-                result.extend(node.values[i])
+    def _lower_bound(self, keys: List[Any], key: Any) -> int:
+        """Index of the first key that is not less than key"""
+        try:
+            return bisect_left(keys, key)
+        except TypeError:
+            # Mixed or None keys: fall back to the generic comparison
+            i = 0
+            while i < len(keys) and self._compare_keys(key, keys[i]) > 0:
                 i += 1
-                if i < len(node.children):
-                    self._range_search_node(node.children[i], start_key, end_key, result)
+            return i
+    
+    def _upper_bound(self, keys: List[Any], key: Any) -> int:
+        """Index of the first key that is greater than key"""
+        try:
+            return bisect_right(keys, key)
+        except TypeError:
+            # Mixed or None keys: fall back to the generic comparison
+            i = len(keys)
+            while i > 0 and self._compare_keys(key, keys[i-1]) < 0:
+                i -= 1
+            return i
     
     @staticmethod
     def _compare_keys(key1: Any, key2: Any) -> int:
@@ -0,0 +1,35 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+class HashIndex:
+    """Dict-backed index answering equality lookups without a tree descent"""
+
+    def __init__(self):
+        self._buckets: Dict[Any, List[int]] = {}
+
+    def insert(self, key: Any, row_id: int) -> None:
+        """Insert a key-value pair into the index"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = [row_id]
+        else:
+            bucket.append(row_id)
+
+    def bulk_insert(self, keys: List[Any], row_ids: Iterable[int]) -> None:
+        """Insert a batch of keys with their row IDs"""
+        for key, row_id in zip(keys, row_ids):
+            self.insert(key, row_id)
+
+    def bulk_load(self, pairs: List[Tuple[Any, int]]) -> None:
+        """Build the index from scratch out of (key, row_id) pairs"""
+        self._buckets = {}
+        for key, row_id in pairs:
+            self.insert(key, row_id)
+
+    def search(self, key: Any) -> List[int]:
+        """Return all row IDs stored under key"""
+        try:
+            return self._buckets.get(key, [])
+        except TypeError:
+            # Unhashable lookup values cannot match any stored key
+            return []
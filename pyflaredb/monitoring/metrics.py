@@ -1,33 +1,101 @@
 from typing import Dict, List
 import time
+import itertools
 from collections import deque
 import threading
 
 
+class _WindowStats:
+    """Sliding window of query times with running aggregates"""
+
+    __slots__ = ("times", "total", "min_time", "max_time", "_stale_extremes")
+
+    def __init__(self, window_size: int):
+        self.times = deque(maxlen=window_size)
+        self.total = 0.0
+        self.min_time = float("inf")
+        self.max_time = float("-inf")
+        self._stale_extremes = False
+
+    def add(self, execution_time: float):
+        """Append a time, evicting the oldest one once the window is full"""
+        times = self.times
+        if len(times) == times.maxlen:
+            evicted = times[0]
+            self.total -= evicted
+            # Only rescan the window if the evicted time was an extreme
+            if evicted == self.min_time or evicted == self.max_time:
+                self._stale_extremes = True
+        times.append(execution_time)
+        self.total += execution_time
+        if execution_time < self.min_time:
+            self.min_time = execution_time
+        if execution_time > self.max_time:
+            self.max_time = execution_time
+
+    def extremes(self):
+        """Return (min, max) of the window, rescanning it if they went stale"""
+        if self._stale_extremes:
+            self.min_time = min(self.times)
+            self.max_time = max(self.times)
+            self._stale_extremes = False
+        return self.min_time, self.max_time
+
+
 class PerformanceMetrics:
-    def __init__(self, window_size: int = 1000):
-        self.window_size = window_size
-        self.query_times: Dict[str, deque] = {}
-        self.lock = threading.Lock()
+    def __init__(self, window_size: int = 1000, num_shards: int = 16):
+        self.window_size = window_size  # Per shard; each thread records into one shard
+        self._shards: List[Dict[str, _WindowStats]] = [{} for _ in range(num_shards)]
+        self._shard_locks = [threading.Lock() for _ in range(num_shards)]
+        self._local = threading.local()
+        self._next_shard = itertools.count()
+
+    def _shard_index(self) -> int:
+        """Shard owned by the calling thread, assigned round-robin on first use"""
+        try:
+            return self._local.shard
+        except AttributeError:
+            self._local.shard = next(self._next_shard) % len(self._shards)
+            return self._local.shard
 
     def record_query(self, query_type: str, execution_time: float):
         """Record query execution time"""
-        with self.lock:
-            if query_type not in self.query_times:
-                self.query_times[query_type] = deque(maxlen=self.window_size)
-            self.query_times[query_type].append(execution_time)
+        shard_index = self._shard_index()
+        with self._shard_locks[shard_index]:
+            query_times = self._shards[shard_index]
+            if query_type not in query_times:
+                query_times[query_type] = _WindowStats(self.window_size)
+            query_times[query_type].add(execution_time)
 
     def get_metrics(self) -> Dict[str, Dict[str, float]]:
         """Get performance metrics"""
+        merged: Dict[str, Dict[str, float]] = {}
+        for query_times, lock in zip(self._shards, self._shard_locks):
+            with lock:
+                for query_type, stats in query_times.items():
+                    if not stats.times:
+                        continue
+                    min_time, max_time = stats.extremes()
+                    totals = merged.get(query_type)
+                    if totals is None:
+                        merged[query_type] = {
+                            "total": stats.total,
+                            "max_time": max_time,
+                            "min_time": min_time,
+                            "count": len(stats.times),
+                        }
+                    else:
+                        totals["total"] += stats.total
+                        totals["max_time"] = max(totals["max_time"], max_time)
+                        totals["min_time"] = min(totals["min_time"], min_time)
+                        totals["count"] += len(stats.times)
+
         metrics = {}
-        with self.lock:
-            for query_type, times in self.query_times.items():
-                if not times:
-                    continue
-                metrics[query_type] = {
-                    "avg_time": sum(times) / len(times),
-                    "max_time": max(times),
-                    "min_time": min(times),
-                    "count": len(times),
-                }
+        for query_type, totals in merged.items():
+            metrics[query_type] = {
+                "avg_time": totals["total"] / totals["count"],
+                "max_time": totals["max_time"],
+                "min_time": totals["min_time"],
+                "count": totals["count"],
+            }
         return metrics
@@ -1,14 +1,32 @@
-from typing import List, Dict, Any, Callable, Tuple, Optional
+from typing import List, Dict, Any, Callable, Iterable, Sequence, Tuple, Optional
 import operator
+import re
+import heapq
+import numpy as np
 from ..table import Table
+from ..indexing.hash_index import HashIndex
 from .parser import SelectStatement, InsertStatement
 from ..transaction import Transaction
 
+# `FUNC(*)`, `FUNC(column)` or `FUNC(CASE WHEN column THEN 1 ELSE 0 END)`, optionally aliased
+_AGGREGATE_RE = re.compile(
+    r'^(COUNT|SUM|AVG|MIN|MAX)\(\s*(?:(\*)|(\w+)|CASE\s+WHEN\s+(\w+)\s+THEN\s+1\s+ELSE\s+0\s+END)\s*\)'
+    r'(?:\s+AS\s+(\w+))?$',
+    re.IGNORECASE
+)
+
+# NumPy reductions for the aggregate functions over non-NULL values
+_REDUCTIONS = {
+    'SUM': np.sum,
+    'AVG': np.mean,
+    'MIN': np.min,
+    'MAX': np.max,
+}
+
 
 class QueryExecutor:
     def __init__(self, tables: Dict[str, Table]):
         self.tables = tables
-        self._compiled_conditions = {}
         self._comparison_ops = {
             '>': operator.gt,
             '<': operator.lt,
@@ -18,26 +36,13 @@ class QueryExecutor:
             '!=': operator.ne
         }
 
-    def _parse_where_clause(self, where_clause: str) -> List[Tuple[str, str, str]]:
-        """Parse WHERE clause into list of (field, operator, value) tuples"""
-        conditions = []
-        # Split on AND if present
-        subclauses = [c.strip() for c in where_clause.split(' AND ')]
-        
-        for subclause in subclauses:
-            # Find the operator
-            operator_found = None
-            for op in ['>=', '<=', '>', '<', '=', '!=']:
-                if op in subclause:
-                    operator_found = op
-                    field, value = subclause.split(op)
-                    conditions.append((field.strip(), op, value.strip()))
-                    break
-            
-            if not operator_found:
-                raise ValueError(f"Invalid condition: {subclause}")
-        
-        return conditions
+    def _parse_where_clause(self, where_clause: str) -> Tuple[Tuple[str, str, Any], ...]:
+        """Parse an AND-only WHERE clause into (field, operator, value) tuples"""
+        groups = Table._parse_where(where_clause)
+        if len(groups) != 1:
+            # OR-ed conditions cannot be checked one at a time
+            raise ValueError(f"Not a conjunction of conditions: {where_clause}")
+        return groups[0]
     
     def execute(self, statement, transaction: Optional[Transaction] = None):
         """Execute a parsed SQL statement"""
@@ -61,9 +66,15 @@ class QueryExecutor:
             # Handle transaction isolation level logic here
             pass
         
-        # Handle COUNT(*) separately
+        # Handle COUNT(*) separately, without materializing any row
         if len(stmt.columns) == 1 and stmt.columns[0].lower() == "count(*)":
-            return [{"count": len(table.data)}]
+            return [{"count": self._count_rows(table, stmt.where_clause, stmt.parameters)}]
+        
+        # Pure aggregations are reduced over the column store in one pass
+        if not stmt.group_by:
+            aggregates = self._columnar_aggregates(table, stmt)
+            if aggregates is not None:
+                return aggregates
         
         # Try to use index for WHERE clause
         if stmt.where_clause:
@@ -72,36 +83,37 @@ class QueryExecutor:
                 
                 # Check if we can use an index for any condition
                 for field, op, value in conditions:
-                    if field in table._indexes:
+                    # Range predicates on numeric columns are cheaper as a vectorized scan
+                    column_array = table._columns.get(field)
+                    if op != '=' and column_array is not None and column_array.is_numeric:
+                        continue
+                    index = table._indexes.get(field)
+                    # Hash indexes only answer equality lookups
+                    if op != '=' and isinstance(index, HashIndex):
+                        continue
+                    if index is not None:
                         # Convert value to proper type
-                        column = next((col for col in table.columns if col.name == field), None)
-                        if column:
-                            try:
-                                if column.data_type == "integer":
-                                    value = int(value)
-                                elif column.data_type == "float":
-                                    value = float(value)
-                            except (ValueError, TypeError):
-                                continue
+                        try:
+                            value = table._condition_value(field, value, stmt.parameters)
+                        except (ValueError, TypeError):
+                            continue
                         
                         # Use index for lookup
                         if op == '=':
-                            results = table.find_by_index(field, value)
+                            results = table._rows(index.search(value))
                         elif op in {'>', '>='}:
-                            results = table.range_search(field, value, None)
+                            results = table._rows(index.range_search(value, None))
                         elif op in {'<', '<='}:
-                            results = table.range_search(field, None, value)
+                            results = table._rows(index.range_search(None, value))
                         else:  # op == '!='
                             # For inequality, we still need to scan
-                            results = table.data
+                            results = table._rows()
                         
                         # Apply remaining conditions
-                        filtered_results = []
-                        for row in results:
-                            if self._matches_all_conditions(row, conditions):
-                                filtered_results.append(row)
+                        predicate = table._compile_where(stmt.where_clause, stmt.parameters)
+                        filtered_results = filter(predicate, results)
                         
-                        return self._process_results(filtered_results, stmt)
+                        return self._process_results(self._project(filtered_results, stmt), stmt)
             except ValueError:
                 # If WHERE clause parsing fails, fall back to table scan
                 pass
@@ -109,88 +121,245 @@ class QueryExecutor:
         # Fall back to full table scan
         return self._table_scan(table, stmt)
     
-    def _matches_all_conditions(self, row: Dict[str, Any], conditions: List[Tuple[str, str, str]]) -> bool:
-        """Check if row matches all conditions"""
+    def _count_rows(self, table: Table, where_clause: Optional[str],
+                    parameters: Sequence[Any] = ()) -> int:
+        """Count the rows matching a WHERE clause"""
+        if not where_clause:
+            return len(table.data)
+        
+        mask, predicate = self._filter(table, where_clause, parameters)
+        if predicate is None:
+            return int(mask.sum())
+        
+        rows = table._rows(None if mask is None else np.flatnonzero(mask))
+        return sum(1 for row in rows if predicate(row))
+    
+    def _columnar_aggregates(self, table: Table, stmt: SelectStatement) -> Optional[List[Dict[str, Any]]]:
+        """Evaluate a SELECT made only of aggregates with NumPy reductions
+        
+        Returns None if a selected column is not a supported aggregate or the
+        WHERE clause cannot be evaluated entirely as a column-store mask.
+        """
+        specs = [_AGGREGATE_RE.match(col.strip()) for col in stmt.columns]
+        if not all(specs):
+            return None
+        
+        mask = None
+        if stmt.where_clause:
+            try:
+                conditions = self._parse_where_clause(stmt.where_clause)
+            except ValueError:
+                return None
+            mask, remaining = self._vectorized_mask(table, conditions, stmt.parameters)
+            if remaining:
+                return None
+        
+        row = {}
+        for col, spec in zip(stmt.columns, specs):
+            func, star, column, case_column, alias = spec.groups()
+            func = func.upper()
+            key = alias or col.strip()
+            
+            if star is not None:
+                if func != 'COUNT':
+                    return None
+                row[key] = table._n_rows if mask is None else int(np.count_nonzero(mask))
+                continue
+            
+            column_array = table._columns.get(column or case_column)
+            if column_array is None:
+                return None
+            values, valid = table.scan_columnar(column or case_column)
+            if case_column is not None:
+                # CASE WHEN flag THEN 1 ELSE 0 END over a boolean column
+                if column_array.data_type != "boolean":
+                    return None
+                values = (values & valid).astype(np.int64)
+                valid = np.ones(len(values), dtype=bool)
+            elif func != 'COUNT' and not column_array.is_numeric:
+                return None
+            
+            selected = valid if mask is None else valid & mask
+            if func == 'COUNT':
+                row[key] = int(np.count_nonzero(selected))
+            elif not selected.any():
+                # Aggregates over no values are NULL
+                row[key] = None
+            else:
+                row[key] = _REDUCTIONS[func](values[selected]).item()
+        return [row]
+    
+    def _filter(self, table: Table, where_clause: str, parameters: Sequence[Any] = ()
+                ) -> Tuple[Optional[np.ndarray], Optional[Callable[[Dict[str, Any]], bool]]]:
+        """Split a WHERE clause into a column-store mask and a row predicate
+        
+        Rows match if they are selected by the mask (when there is one) and pass the
+        predicate (when there is one). The parameters are bound to the placeholders
+        of the clause. A clause that cannot be parsed matches nothing.
+        """
+        try:
+            conditions = self._parse_where_clause(where_clause)
+        except ValueError:
+            # OR-ed conditions are only checked row by row
+            conditions = None
+        
+        mask = None
+        if conditions is not None:
+            mask, remaining = self._vectorized_mask(table, conditions, parameters)
+            if mask is not None and not remaining:
+                return mask, None
+        
+        try:
+            return mask, table._compile_where(where_clause, parameters)
+        except ValueError:
+            return np.zeros(len(table.data), dtype=bool), None
+    
+    def _vectorized_mask(self, table: Table, conditions: Sequence[Tuple[str, str, Any]],
+                         parameters: Sequence[Any] = ()
+                         ) -> Tuple[Optional[np.ndarray], List[Tuple[str, str, Any]]]:
+        """Evaluate conditions on numeric and boolean columns as a NumPy mask over the column store
+        
+        Returns the combined mask (None if no condition could be vectorized) and the
+        conditions that still have to be checked row by row.
+        """
+        mask = None
+        remaining = []
         for field, op, value in conditions:
-            row_value = row.get(field)
-            if row_value is None:
-                return False
+            column_array = table._columns.get(field)
+            if column_array is None or not (
+                column_array.is_numeric
+                or (column_array.data_type == "boolean" and op in ('=', '!='))
+            ):
+                remaining.append((field, op, value))
+                continue
             
-            # Convert value to proper type based on row_value
             try:
-                if isinstance(row_value, int):
-                    value = int(value)
-                elif isinstance(row_value, float):
-                    value = float(value)
+                literal = table._condition_value(field, value, parameters)
             except (ValueError, TypeError):
-                return False
+                # The value can never match a value of this column
+                return np.zeros(len(column_array), dtype=bool), []
             
-            # Apply comparison
-            op_func = self._comparison_ops[op]
-            try:
-                if not op_func(row_value, value):
-                    return False
-            except TypeError:
-                return False
+            condition_mask = column_array.valid & self._comparison_ops[op](column_array.values, literal)
+            if mask is None:
+                mask = condition_mask
+            else:
+                mask &= condition_mask
         
-        return True
+        return mask, remaining
     
     def _table_scan(self, table: Table, stmt: SelectStatement) -> List[Dict[str, Any]]:
         """Perform a full table scan with filtering"""
-        results = []
+        # Plain SELECT * needs no filtering or projection
+        if (len(stmt.columns) == 1 and stmt.columns[0] == "*" and not stmt.where_clause
+                and not stmt.order_by and stmt.limit is None):
+            return table._rows()
         
-        # Parse WHERE conditions if present
-        conditions = []
+        # Apply WHERE conditions if present
+        row_ids = None  # Matching row positions, when known from the column store
+        predicate = None
         if stmt.where_clause:
-            try:
-                conditions = self._parse_where_clause(stmt.where_clause)
-            except ValueError:
-                # If parsing fails, return empty result
-                return []
+            mask, predicate = self._filter(table, stmt.where_clause, stmt.parameters)
+            if mask is not None:
+                row_ids = np.flatnonzero(mask)
         
-        # Process rows
-        for row in table.data:
-            # Apply WHERE clause
-            if conditions and not self._matches_all_conditions(row, conditions):
-                continue
-            
-            # Select requested columns
-            if "*" in stmt.columns:
-                results.append(row.copy())
-            else:
-                filtered_row = {}
-                for col in stmt.columns:
-                    if "count(" in col.lower():
-                        filtered_row[col] = len(results)
-                    else:
-                        filtered_row[col] = row.get(col)
-                results.append(filtered_row)
+        # ORDER BY on a numeric column can be done on row positions before any
+        # row is materialized
+        sort_column = self._columnar_sort_column(table, stmt) if predicate is None else None
+        if sort_column is not None:
+            if row_ids is None:
+                row_ids = np.arange(len(sort_column))
+            descending = stmt.order_by[0].direction.value == "DESC"
+            row_ids = self._argsort_rows(sort_column, row_ids, descending)
+            if stmt.limit is not None:
+                row_ids = row_ids[:stmt.limit]
         
+        if predicate is None and "*" not in stmt.columns and not any("count(" in col.lower() for col in stmt.columns):
+            # Nothing is left to check per row, so only the selected columns
+            # have to leave the column store
+            results = table._rows(row_ids, stmt.columns)
+        else:
+            rows = table._rows(row_ids)
+            if predicate is not None:
+                rows = filter(predicate, rows)
+            results = self._project(rows, stmt)
+        if sort_column is not None:
+            # Already ordered and limited
+            return results
         return self._process_results(results, stmt)
     
-    def _process_results(self, rows: List[Dict[str, Any]], stmt: SelectStatement) -> List[Dict[str, Any]]:
-        """Process result rows according to SELECT statement"""
+    @staticmethod
+    def _columnar_sort_column(table: Table, stmt: SelectStatement):
+        """Column store array to sort by, if ORDER BY can be evaluated with argsort"""
+        if not stmt.order_by or len(stmt.order_by) != 1:
+            return None
+        
+        column = stmt.order_by[0].column
+        column_array = table._columns.get(column)
+        if column_array is None or not column_array.is_numeric:
+            return None
+        
+        # Keep the semantics of sorting projected rows: the column has to be
+        # selected, and running COUNT columns depend on the final row order
+        if "*" not in stmt.columns and column not in stmt.columns:
+            return None
+        if any("count(" in col.lower() for col in stmt.columns):
+            return None
+        return column_array
+    
+    @staticmethod
+    def _argsort_rows(column_array, row_ids: np.ndarray, descending: bool) -> np.ndarray:
+        """Stable-sort row positions by a column, NULLs last (first when descending)"""
+        valid = column_array.valid[row_ids]
+        valid_ids = row_ids[valid]
+        null_ids = row_ids[~valid]
+        values = column_array.values[valid_ids]
+        
+        if descending:
+            # Sort the reversed values so ties keep their original order
+            order = (len(values) - 1 - np.argsort(values[::-1], kind='stable'))[::-1]
+            return np.concatenate((null_ids, valid_ids[order]))
+        
+        order = np.argsort(values, kind='stable')
+        return np.concatenate((valid_ids[order], null_ids))
+    
+    def _project(self, rows: Iterable[Dict[str, Any]], stmt: SelectStatement) -> List[Dict[str, Any]]:
+        """Select the requested columns from each row"""
+        if "*" in stmt.columns:
+            # Rows are materialized per query, so they need no defensive copy
+            return list(rows)
+        
         results = []
         for row in rows:
-            if "*" in stmt.columns:
-                results.append(row.copy())
-            else:
-                filtered_row = {}
-                for col in stmt.columns:
-                    if "count(" in col.lower():
-                        filtered_row[col] = len(results)
-                    else:
-                        filtered_row[col] = row.get(col)
-                results.append(filtered_row)
-        
+            filtered_row = {}
+            for col in stmt.columns:
+                if "count(" in col.lower():
+                    filtered_row[col] = len(results)
+                else:
+                    filtered_row[col] = row.get(col)
+            results.append(filtered_row)
+        return results
+    
+    def _process_results(self, results: List[Dict[str, Any]], stmt: SelectStatement) -> List[Dict[str, Any]]:
+        """Apply ORDER BY and LIMIT to projected result rows"""
         # Handle ORDER BY
         if stmt.order_by:
-            for order_clause in stmt.order_by:
-                reverse = order_clause.direction.value == "DESC"
-                results.sort(
-                    key=lambda x: (x.get(order_clause.column) is None, x.get(order_clause.column)),
-                    reverse=reverse
-                )
+            directions = {order_clause.direction for order_clause in stmt.order_by}
+            if len(directions) == 1:
+                reverse = stmt.order_by[0].direction.value == "DESC"
+                key = self._sort_key([order_clause.column for order_clause in stmt.order_by])
+                
+                # ORDER BY ... LIMIT k only needs the top k rows, not a full sort
+                if stmt.limit is not None and 0 <= stmt.limit < len(results):
+                    select = heapq.nlargest if reverse else heapq.nsmallest
+                    return select(stmt.limit, results, key=key)
+                results.sort(key=key, reverse=reverse)
+            else:
+                # Mixed directions: stable sorts from the least significant column up
+                for order_clause in reversed(stmt.order_by):
+                    results.sort(
+                        key=self._sort_key([order_clause.column]),
+                        reverse=order_clause.direction.value == "DESC"
+                    )
         
         # Handle LIMIT
         if stmt.limit is not None:
@@ -198,6 +367,14 @@ class QueryExecutor:
         
         return results
     
+    @staticmethod
+    def _sort_key(columns: List[str]) -> Callable[[Dict[str, Any]], Any]:
+        """Build a sort key over the given columns that orders NULLs last"""
+        if len(columns) == 1:
+            column = columns[0]
+            return lambda row: (row.get(column) is None, row.get(column))
+        return lambda row: tuple((row.get(column) is None, row.get(column)) for column in columns)
+    
     def _execute_insert(self, stmt: InsertStatement, transaction: Optional[Transaction] = None) -> bool:
         if stmt.table_name not in self.tables:
             raise ValueError(f"Table {stmt.table_name} does not exist")
@@ -216,28 +393,18 @@ class QueryExecutor:
         
         # Create dictionary of column-value pairs
         row_data = {}
+        cast_fn = table._cast_fn
         for col_name, value in zip(stmt.columns, stmt.values):
-            # Find the column definition
-            column = next((col for col in table.columns if col.name == col_name), None)
-            if not column:
+            cast = cast_fn.get(col_name)
+            if cast is None:
                 raise ValueError(f"Column {col_name} does not exist")
             
             # Convert value based on column type
             if value is not None:
                 try:
-                    if column.data_type == "integer":
-                        row_data[col_name] = int(value)
-                    elif column.data_type == "float":
-                        row_data[col_name] = float(value)
-                    elif column.data_type == "boolean":
-                        if isinstance(value, str):
-                            row_data[col_name] = value.lower() == 'true'
-                        else:
-                            row_data[col_name] = bool(value)
-                    else:  # string type
-                        row_data[col_name] = str(value)
+                    row_data[col_name] = cast(value)
                 except (ValueError, TypeError):
-                    raise ValueError(f"Invalid value for column {column.name}: {value}")
+                    raise ValueError(f"Invalid value for column {col_name}: {value}")
             else:
                 row_data[col_name] = None
         
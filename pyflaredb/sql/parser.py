@@ -1,38 +1,158 @@
 from dataclasses import dataclass
-from typing import List, Optional, Any
+from functools import lru_cache
+import re
+from typing import List, Optional, Any, Tuple
 from enum import Enum
 
 class OrderDirection(Enum):
     ASC = "ASC"
     DESC = "DESC"
 
-@dataclass
+# Statements are immutable so parsed instances can be cached and shared, and
+# slotted since one is built per parsed query
+
+@dataclass(frozen=True, slots=True)
 class OrderByClause:
     column: str
     direction: OrderDirection = OrderDirection.ASC
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SelectStatement:
     table_name: str
-    columns: List[str]
+    columns: Tuple[str, ...]
     where_clause: Optional[str] = None
-    group_by: Optional[List[str]] = None
-    order_by: Optional[List[OrderByClause]] = None
+    group_by: Optional[Tuple[str, ...]] = None
+    order_by: Optional[Tuple[OrderByClause, ...]] = None
     limit: Optional[int] = None
+    parameters: Tuple[Any, ...] = ()  # Values bound to the ? placeholders of where_clause
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class InsertStatement:
     table_name: str
-    columns: List[str]
-    values: List[Any]
+    columns: Tuple[str, ...]
+    values: Tuple[Any, ...]
+
+# The usual `INSERT INTO t (cols) VALUES (vals)` shape, matched in one pass
+_INSERT_FAST = re.compile(
+    r'^\s*INSERT\s+INTO\s+(\w+)\s*\(([^)]+)\)\s*VALUES\s*\(([^)]+)\)\s*;?\s*$', re.IGNORECASE
+)
+
+# One VALUES entry (quoted strings may contain commas) and the comma or end after it
+_VALUE_RE = re.compile(r"""((?:'[^']*'|"[^"]*"|[^,'"])*)(?:,|\Z)""")
 
 class SQLParser:
+    @staticmethod
+    def parse_value(value: str) -> Any:
+        """Convert a literal from a VALUES list to a Python value"""
+        value = value.strip()
+        if value.startswith(("'", '"')) and value.endswith(("'", '"')):
+            # String value - keep quotes
+            return value
+        elif value.lower() == 'true':
+            return True
+        elif value.lower() == 'false':
+            return False
+        elif value.lower() == 'null':
+            return None
+        try:
+            # Try to convert to number if possible
+            if '.' in value:
+                return float(value)
+            return int(value)
+        except ValueError:
+            # If not a number, keep as is
+            return value
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget all cached parsed statements"""
+        SQLParser._parse_insert_normalized.cache_clear()
+        SQLParser._parse_select_normalized.cache_clear()
+    
+    @staticmethod
+    def _split_values(values_str: str) -> List[str]:
+        """Split a VALUES list on the commas that are outside quoted strings"""
+        values = _VALUE_RE.findall(values_str)
+        # The matches cover the whole list unless a quote is left unterminated;
+        # the last match is always an empty one at the end
+        joined = ",".join(values)
+        if joined != values_str and joined != values_str + ",":
+            return SQLParser._merge_quoted_pieces(values_str)
+        values.pop()
+        return [value.strip() for value in values]
+    
+    @staticmethod
+    def _merge_quoted_pieces(values_str: str) -> List[str]:
+        """Split a VALUES list that may contain an unterminated quote"""
+        # Split on every comma, then glue back the pieces of quoted strings that contain commas
+        values = []
+        current = None
+        quote_char = None
+        for piece in values_str.split(","):
+            current = piece if current is None else current + "," + piece
+            if quote_char is not None or "'" in piece or '"' in piece:
+                quote_char = SQLParser._open_quote(piece, quote_char)
+            if quote_char is None:
+                values.append(current)
+                current = None
+        
+        if current is not None:
+            # Unterminated quote
+            values.append(current)
+        if values and not values[-1]:
+            values.pop()
+        return [value.strip() for value in values]
+    
+    @staticmethod
+    def _open_quote(piece: str, quote_char: Optional[str]) -> Optional[str]:
+        """Quote left open at the end of piece, given the one open at its start"""
+        i = 0
+        while True:
+            if quote_char is not None:
+                i = piece.find(quote_char, i)
+                if i == -1:
+                    return quote_char
+                quote_char = None
+            else:
+                single = piece.find("'", i)
+                double = piece.find('"', i)
+                if single == -1 and double == -1:
+                    return None
+                i = single if double == -1 or (single != -1 and single < double) else double
+                quote_char = piece[i]
+            i += 1
+    
     @staticmethod
     def parse_insert(sql: str) -> InsertStatement:
         """Parse INSERT statement"""
-        # Remove newlines and extra spaces
-        sql = ' '.join(sql.split())
+        # Remove newlines and extra spaces, so whitespace variants share a cache entry
+        return SQLParser._parse_insert_normalized(' '.join(sql.split()))
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_insert_normalized(sql: str) -> InsertStatement:
+        """Parse a whitespace-normalized INSERT statement"""
+        match = _INSERT_FAST.match(sql)
+        if match is not None:
+            table_name, columns_str, values_str = match.groups()
+            columns = tuple(col.strip() for col in columns_str.split(","))
+        else:
+            table_name, columns, values_str = SQLParser._scan_insert(sql)
+        
+        # Parse values while respecting quotes
+        values = SQLParser._split_values(values_str)
+        
+        # Clean up values
+        cleaned_values = tuple(SQLParser.parse_value(value) for value in values)
         
+        if len(columns) != len(cleaned_values):
+            raise ValueError(f"Column count ({len(columns)}) doesn't match value count ({len(cleaned_values)})")
+        
+        return InsertStatement(table_name=table_name, columns=columns, values=cleaned_values)
+    
+    @staticmethod
+    def _scan_insert(sql: str) -> Tuple[str, Tuple[str, ...], str]:
+        """Locate the table name, columns and VALUES list of any other INSERT shape"""
         # Extract table name
         table_start = sql.find("INTO") + 4
         table_end = sql.find("(", table_start)
@@ -41,7 +161,7 @@ class SQLParser:
         # Extract columns
         cols_start = sql.find("(", table_end) + 1
         cols_end = sql.find(")", cols_start)
-        columns = [col.strip() for col in sql[cols_start:cols_end].split(",")]
+        columns = tuple(col.strip() for col in sql[cols_start:cols_end].split(","))
         
         # Extract values
         values_start = sql.find("VALUES", cols_end) + 6
@@ -49,113 +169,75 @@ class SQLParser:
         values_end = sql.find(")", values_start)
         values_str = sql[values_start:values_end]
         
-        # Parse values while respecting quotes
-        values = []
-        current_value = ""
-        in_quotes = False
-        quote_char = None
-        
-        for char in values_str:
-            if char in ["'", '"']:
-                if not in_quotes:
-                    in_quotes = True
-                    quote_char = char
-                elif quote_char == char:
-                    in_quotes = False
-                    quote_char = None
-                current_value += char
-            elif char == ',' and not in_quotes:
-                values.append(current_value.strip())
-                current_value = ""
-            else:
-                current_value += char
-        
-        if current_value:
-            values.append(current_value.strip())
-        
-        # Clean up values
-        cleaned_values = []
-        for value in values:
-            value = value.strip()
-            if value.startswith(("'", '"')) and value.endswith(("'", '"')):
-                # String value - keep quotes
-                cleaned_values.append(value)
-            elif value.lower() == 'true':
-                cleaned_values.append(True)
-            elif value.lower() == 'false':
-                cleaned_values.append(False)
-            elif value.lower() == 'null':
-                cleaned_values.append(None)
-            else:
-                try:
-                    # Try to convert to number if possible
-                    if '.' in value:
-                        cleaned_values.append(float(value))
-                    else:
-                        cleaned_values.append(int(value))
-                except ValueError:
-                    # If not a number, keep as is
-                    cleaned_values.append(value)
-        
-        if len(columns) != len(cleaned_values):
-            raise ValueError(f"Column count ({len(columns)}) doesn't match value count ({len(cleaned_values)})")
-        
-        return InsertStatement(table_name=table_name, columns=columns, values=cleaned_values)
+        return table_name, columns, values_str
     
     @staticmethod
     def parse_select(sql: str) -> SelectStatement:
         """Parse SELECT statement"""
-        # Remove newlines and extra spaces
-        sql = ' '.join(sql.split())
+        # Remove newlines and extra spaces, so whitespace variants share a cache entry
+        return SQLParser._parse_select_normalized(' '.join(sql.split()))
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_select_normalized(sql: str) -> SelectStatement:
+        """Parse a whitespace-normalized SELECT statement"""
+        # Upper-case the query once for every keyword search
+        upper_sql = sql.upper()
         
         # Extract table name
-        from_idx = sql.upper().find("FROM")
+        from_idx = upper_sql.find("FROM")
         if from_idx == -1:
             raise ValueError("Invalid SELECT statement: missing FROM clause")
         
         # Extract columns
         columns_str = sql[6:from_idx].strip()
-        columns = [col.strip() for col in columns_str.split(",")]
+        columns = tuple(col.strip() for col in columns_str.split(","))
         
         # Find all clause positions
-        where_idx = sql.upper().find("WHERE")
-        group_idx = sql.upper().find("GROUP BY")
-        order_idx = sql.upper().find("ORDER BY")
-        limit_idx = sql.upper().find("LIMIT")
+        where_idx = upper_sql.find("WHERE")
+        group_idx = upper_sql.find("GROUP BY")
+        order_idx = upper_sql.find("ORDER BY")
+        limit_idx = upper_sql.find("LIMIT")
+        
+        # Each clause ends where the next clause present in the query starts
+        sql_end = len(sql)
+        limit_end = sql_end
+        order_end = limit_idx if limit_idx != -1 else limit_end
+        group_end = order_idx if order_idx != -1 else order_end
+        where_end = group_idx if group_idx != -1 else group_end
+        table_end = where_idx if where_idx != -1 else where_end
         
-        # Find table name end position
-        table_end = min(x for x in [where_idx, group_idx, order_idx, limit_idx] if x != -1) if any(x != -1 for x in [where_idx, group_idx, order_idx, limit_idx]) else len(sql)
         table_name = sql[from_idx + 4:table_end].strip()
         
         # Parse WHERE clause
         where_clause = None
         if where_idx != -1:
-            where_end = min(x for x in [group_idx, order_idx, limit_idx] if x != -1) if any(x != -1 for x in [group_idx, order_idx, limit_idx]) else len(sql)
             where_clause = sql[where_idx + 5:where_end].strip()
         
         # Parse GROUP BY clause
         group_by = None
         if group_idx != -1:
-            group_end = min(x for x in [order_idx, limit_idx] if x != -1) if any(x != -1 for x in [order_idx, limit_idx]) else len(sql)
             group_by_str = sql[group_idx + 8:group_end].strip()
-            group_by = [col.strip() for col in group_by_str.split(",")]
+            group_by = tuple(col.strip() for col in group_by_str.split(","))
         
         # Parse ORDER BY clause
         order_by = None
         if order_idx != -1:
-            order_end = limit_idx if limit_idx != -1 else len(sql)
             order_str = sql[order_idx + 8:order_end].strip()
             order_parts = order_str.split(",")
+            upper_parts = upper_sql[order_idx + 8:order_end].strip().split(",")
             order_by = []
-            for part in order_parts:
+            for part, upper_part in zip(order_parts, upper_parts):
                 part = part.strip()
-                if " DESC" in part.upper():
-                    column = part[:part.upper().find(" DESC")].strip()
+                desc_idx = upper_part.strip().find(" DESC")
+                if desc_idx != -1:
+                    column = part[:desc_idx].strip()
                     direction = OrderDirection.DESC
                 else:
                     column = part.replace(" ASC", "").strip()
                     direction = OrderDirection.ASC
                 order_by.append(OrderByClause(column=column, direction=direction))
+            order_by = tuple(order_by)
         
         # Parse LIMIT clause
         limit = None
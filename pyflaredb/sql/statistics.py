@@ -14,25 +14,48 @@ class TableStatistics:
         self.table_sizes[table.name] = len(table.data)
 
         for column in table.columns:
-            values = [row[column.name] for row in table.data if column.name in row]
-
-            if not values:
+            # Work on the table's column store instead of gathering values from the rows
+            column_array = table._columns[column.name]
+            if len(column_array) == 0:
                 continue
 
+            valid = column_array.valid
+            values = column_array.values[valid]
+            null_count = len(column_array) - len(values)
+            numeric = column.data_type in ("integer", "float", "boolean")
+
+            if numeric:
+                # One sort gives the distinct count and the extremes; the
+                # histogram and moments then share a single float64 copy
+                values = np.sort(values)
+                distinct_count = int(np.count_nonzero(values[1:] != values[:-1])) + 1 if len(values) else 0
+                lowest = values[0] if len(values) else None
+                highest = values[-1] if len(values) else None
+            else:
+                distinct_count = len(set(values.tolist()))
+                lowest = values.min() if len(values) else None
+                highest = values.max() if len(values) else None
+
             stats = {
-                "distinct_count": len(set(values)),
-                "null_count": sum(1 for v in values if v is None),
-                "min": min(values) if values and None not in values else None,
-                "max": max(values) if values and None not in values else None,
+                "distinct_count": distinct_count + (1 if null_count else 0),
+                "null_count": null_count,
+                "min": self._to_python(lowest) if not null_count else None,
+                "max": self._to_python(highest) if not null_count else None,
             }
 
-            if isinstance(values[0], (int, float)):
+            if numeric and len(values):
+                as_float = values.astype(np.float64)
                 stats.update(
                     {
-                        "mean": np.mean(values),
-                        "std_dev": np.std(values),
-                        "histogram": np.histogram(values, bins=100),
+                        "mean": as_float.mean(),
+                        "std_dev": as_float.std(),
+                        "histogram": np.histogram(as_float, bins=100),
                     }
                 )
 
             self.column_stats[f"{table.name}.{column.name}"] = stats
+
+    @staticmethod
+    def _to_python(value: Any) -> Any:
+        """Unwrap NumPy scalars into the Python values stored in the rows"""
+        return value.item() if isinstance(value, np.generic) else value
@@ -0,0 +1,100 @@
+from typing import Any, Iterable, List, Optional, Sequence
+import numpy as np
+
+# NumPy dtypes for column types that can be stored unboxed
+_DTYPES = {
+    "integer": np.dtype(np.int64),
+    "float": np.dtype(np.float64),
+    "boolean": np.dtype(np.bool_),
+}
+
+
+class ColumnArray:
+    """Growable typed array holding the values of a single table column"""
+
+    def __init__(self, data_type: str, capacity: int = 1024):
+        self.data_type = data_type
+        self.dtype = _DTYPES.get(data_type, np.dtype(object))
+        self._values = np.empty(capacity, dtype=self.dtype)
+        self._valid = np.zeros(capacity, dtype=bool)  # False where the value is NULL
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def is_numeric(self) -> bool:
+        """Whether comparisons on this column can be evaluated as NumPy masks"""
+        return self.data_type in ("integer", "float")
+
+    @property
+    def values(self) -> np.ndarray:
+        """View of the stored values (NULL slots hold a placeholder)"""
+        return self._values[:self._size]
+
+    @property
+    def valid(self) -> np.ndarray:
+        """View of the non-NULL mask"""
+        return self._valid[:self._size]
+
+    def get(self, row_id: int) -> Any:
+        """Python value at one row position, None if it is NULL"""
+        if not self._valid[row_id]:
+            return None
+        value = self._values[row_id]
+        return value if self.dtype == object else value.item()
+
+    def take(self, row_ids: Optional[Iterable[int]] = None) -> List[Any]:
+        """Python values at the given row positions (all rows if None), with NULLs as None"""
+        if row_ids is None:
+            values, valid = self.values, self.valid
+        else:
+            row_ids = np.asarray(row_ids, dtype=np.intp)
+            values, valid = self._values[row_ids], self._valid[row_ids]
+
+        result = values.tolist()
+        if self.dtype != object:
+            # Unboxed NULL slots hold a placeholder
+            for i in np.flatnonzero(~valid).tolist():
+                result[i] = None
+        return result
+
+    def extend(self, values: Sequence[Any]) -> None:
+        """Append values to the end of the column"""
+        n = len(values)
+        if n == 0:
+            return
+
+        if isinstance(values, np.ndarray) and values.dtype == self.dtype and self.dtype != object:
+            # Already unboxed and free of NULLs
+            valid = np.ones(n, dtype=bool)
+            converted = values
+        elif self.dtype == object:
+            valid = np.fromiter((v is not None for v in values), dtype=bool, count=n)
+            converted = np.empty(n, dtype=object)
+            converted[:] = values
+        else:
+            valid = np.fromiter((v is not None for v in values), dtype=bool, count=n)
+            converted = np.array(
+                [v if v is not None else 0 for v in values], dtype=self.dtype
+            )
+
+        self._reserve(self._size + n)
+        end = self._size + n
+        self._values[self._size:end] = converted
+        self._valid[self._size:end] = valid
+        self._size = end
+
+    def _reserve(self, size: int) -> None:
+        """Grow the backing arrays geometrically to hold at least size values"""
+        capacity = len(self._values)
+        if size <= capacity:
+            return
+
+        new_capacity = max(size, capacity * 2)
+        values = np.empty(new_capacity, dtype=self.dtype)
+        values[:self._size] = self._values[:self._size]
+        valid = np.zeros(new_capacity, dtype=bool)
+        valid[:self._size] = self._valid[:self._size]
+        self._values = values
+        self._valid = valid
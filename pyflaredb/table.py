@@ -1,10 +1,17 @@
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterator, List, Any, Optional, Sequence, Tuple, Union
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import datetime
 from collections import defaultdict
+from functools import lru_cache, partial
+import re
+import sys
+import numpy as np
 from .indexing.btree import BTreeIndex
+from .indexing.hash_index import HashIndex
+from .storage.columnar import ColumnArray
 
-@dataclass
+@dataclass(slots=True)
 class Column:
     name: str
     data_type: str
@@ -12,18 +19,325 @@ class Column:
     unique: bool = False
     primary_key: bool = False
     default: Any = None
+    
+    def __post_init__(self):
+        # Normalize once so type dispatch compares interned lower-case names
+        self.name = sys.intern(self.name)
+        self.data_type = sys.intern(self.data_type.lower())
+
+def _to_bool(value: Any) -> bool:
+    """Convert a value to bool, reading strings as true/false literals"""
+    if isinstance(value, str):
+        return value.lower() == 'true'
+    return bool(value)
+
+# Conversion applied to inserted values, per column type (anything else is stored as a string)
+_CAST_FUNCTIONS: Dict[str, Callable[[Any], Any]] = {
+    "integer": int,
+    "float": float,
+    "boolean": _to_bool,
+}
+
+# One `field op value` condition, optionally followed by AND or OR
+_CONDITION_RE = re.compile(
+    r'\s*(\w+)\s*(>=|<=|!=|>|<|=)\s*(.+?)(?:\s+(AND|OR)\s+|\s*$)', re.IGNORECASE
+)
+
+# `field BETWEEN low AND high`, evaluated as two range conditions
+_BETWEEN_RE = re.compile(r'(\w+)\s+BETWEEN\s+(\S+)\s+AND\s+(\S+)', re.IGNORECASE)
+
+# Python spelling of the WHERE comparison operators
+_PYTHON_OPS = {
+    '>': '>',
+    '<': '<',
+    '>=': '>=',
+    '<=': '<=',
+    '=': '==',
+    '!=': '!='
+}
+
+class _Placeholder:
+    """A ? in a WHERE clause, standing for the bound parameter at index"""
+    __slots__ = ('index',)
+    
+    def __init__(self, index: int):
+        self.index = index
+    
+    def __repr__(self) -> str:
+        return f"_Placeholder({self.index})"
+
+# Bound parameter value of a placeholder that cannot match any value of its column
+_NO_MATCH = object()
+
+class _TableRows(Sequence):
+    """Read-only view of a table's rows in row format, built from its column store"""
+    
+    def __init__(self, table: 'Table'):
+        self._table = table
+    
+    def __len__(self) -> int:
+        return self._table._n_rows
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._table._rows(range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return self._table._rows([index])[0]
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._table._rows())
+
+class RowView(Mapping):
+    """Read-only row that reads its values from the column store on access
+    
+    Cheaper than a row dict when only a few columns of each row are used.
+    """
+    
+    __slots__ = ('_cols', '_rid')
+    
+    def __init__(self, columns: Dict[str, ColumnArray], row_id: int):
+        self._cols = columns
+        self._rid = row_id
+    
+    def __getitem__(self, key: str) -> Any:
+        return self._cols[key].get(self._rid)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._cols)
+    
+    def __len__(self) -> int:
+        return len(self._cols)
+    
+    def __repr__(self) -> str:
+        return f"RowView({self.to_dict()!r})"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the row as a dict"""
+        return {name: column.get(self._rid) for name, column in self._cols.items()}
 
 class Table:
     def __init__(self, name: str, columns: List[Column]):
         self.name = name
         self.columns = columns
-        self.data: List[Dict[str, Any]] = []
+        self._n_rows = 0
         self._unique_indexes: Dict[str, Dict[Any, int]] = defaultdict(dict)
-        self._compiled_conditions = {}
-        self._indexes: Dict[str, BTreeIndex] = {}
+        self._compiled_conditions: Dict[str, Tuple[Callable[..., bool], Tuple[str, ...]]] = {}
+        self._compiled_conditions_size = 256
+        self._indexes: Dict[str, Union[BTreeIndex, HashIndex]] = {}
         
         # Validate column definitions
         self._validate_columns()
+        
+        # Column lookups and value conversions, resolved once per table
+        self._column_by_name: Dict[str, Column] = {col.name: col for col in self.columns}
+        self._cast_fn: Dict[str, Callable[[Any], Any]] = {
+            col.name: _CAST_FUNCTIONS.get(col.data_type, str) for col in self.columns
+        }
+        self._unique_columns: List[Column] = [col for col in self.columns if col.unique]
+        # (name, converter, nullable, default, unique) per column, for validating inserted rows
+        self._converters: List[Tuple[str, Callable[[Any], Any], bool, Any, bool]] = [
+            (col.name, self._cast_fn[col.name], col.nullable, col.default, col.unique)
+            for col in self.columns
+        ]
+        
+        # Rows are stored column by column; row IDs are positions in the columns
+        self._columns: Dict[str, ColumnArray] = {
+            col.name: ColumnArray(col.data_type) for col in self.columns
+        }
+        # Row builders per tuple of column names, see _row_maker
+        self._row_makers: Dict[Tuple[str, ...], Callable[..., Dict[str, Any]]] = {}
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_where(where_clause: str) -> Tuple[Tuple[Tuple[str, str, Any], ...], ...]:
+        """Parse a WHERE clause into OR-ed groups of AND-ed (field, operator, value) conditions
+        
+        Values are literal strings, or a _Placeholder for each ? in order.
+        """
+        where_clause = _BETWEEN_RE.sub(r'\1 >= \2 AND \1 <= \3', where_clause)
+        groups = [[]]
+        placeholders = 0
+        pos = 0
+        while pos < len(where_clause):
+            # Conditions must follow each other with nothing in between
+            match = _CONDITION_RE.match(where_clause, pos)
+            if not match:
+                raise ValueError(f"Invalid condition: {where_clause[pos:].strip()}")
+            field, op, value, connector = match.groups()
+            if value == "?":
+                value = _Placeholder(placeholders)
+                placeholders += 1
+            groups[-1].append((field, op, value))
+            if connector is not None and connector.upper() == "OR":
+                groups.append([])
+            pos = match.end()
+        
+        if not all(groups):
+            raise ValueError(f"Invalid condition: {where_clause}")
+        return tuple(tuple(group) for group in groups)
+    
+    @staticmethod
+    def _placeholder_count(where_clause: str) -> int:
+        """Number of ? placeholders among the conditions of a WHERE clause"""
+        return sum(
+            isinstance(value, _Placeholder)
+            for group in Table._parse_where(where_clause)
+            for _, _, value in group
+        )
+    
+    def _cast_literal(self, field: str, value: str) -> Any:
+        """Convert a WHERE literal to the Python type stored for the column"""
+        column = self._column_by_name.get(field)
+        if column is None:
+            return value
+        if column.data_type == "integer":
+            return int(value)
+        if column.data_type == "float":
+            return float(value)
+        if column.data_type == "boolean":
+            lowered = value.lower()
+            if lowered not in ('true', 'false'):
+                raise ValueError(f"Invalid boolean literal: {value}")
+            return lowered == 'true'
+        return value
+    
+    def _cast_parameter(self, field: str, value: Any) -> Any:
+        """Convert a bound WHERE parameter to the Python type stored for the column
+        
+        A parameter matches what its literal would: numbers and booleans, and
+        strings compared with numeric or boolean columns, are cast by
+        _cast_literal from their text. Other strings stay opaque values and
+        match what the quoted literal would (the parser keeps the quotes of
+        string literals).
+        """
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, str):
+            column = self._column_by_name.get(field)
+            if column is None or column.data_type not in _CAST_FUNCTIONS:
+                return f"'{value}'"
+            return self._cast_literal(field, value)
+        if isinstance(value, (bool, int, float)):
+            return self._cast_literal(field, str(value))
+        raise ValueError(f"Parameter {value!r} cannot match column {field}")
+    
+    def _condition_value(self, field: str, value: Any, parameters: Sequence[Any]) -> Any:
+        """Python value a parsed condition compares with, binding placeholders to parameters"""
+        if isinstance(value, _Placeholder):
+            if value.index >= len(parameters):
+                raise ValueError(f"No parameter bound to placeholder {value.index + 1}")
+            return self._cast_parameter(field, parameters[value.index])
+        return self._cast_literal(field, value)
+    
+    def _compile_where(self, where_clause: str,
+                       parameters: Sequence[Any] = ()) -> Callable[[Dict[str, Any]], bool]:
+        """Compile a WHERE clause into a row predicate with parameters bound to its placeholders
+        
+        The clause is compiled once and cached; binding parameters only casts them.
+        """
+        predicate, placeholder_fields = self._compiled_where(where_clause)
+        if not placeholder_fields:
+            return predicate
+        if len(parameters) != len(placeholder_fields):
+            raise ValueError(
+                f"Expected {len(placeholder_fields)} parameters, got {len(parameters)}"
+            )
+        
+        values = []
+        for field, parameter in zip(placeholder_fields, parameters):
+            try:
+                values.append(self._cast_parameter(field, parameter))
+            except (ValueError, TypeError):
+                values.append(_NO_MATCH)
+        return partial(predicate, _p=tuple(values))
+    
+    def _compiled_where(self, where_clause: str) -> Tuple[Callable[..., bool], Tuple[str, ...]]:
+        """Compiled predicate of a WHERE clause and its placeholder fields, cached per clause"""
+        compiled = self._compiled_conditions.get(where_clause)
+        if compiled is None:
+            compiled = self._compile_conditions(where_clause)
+            if len(self._compiled_conditions) >= self._compiled_conditions_size:
+                # Evict the oldest compiled clause
+                del self._compiled_conditions[next(iter(self._compiled_conditions))]
+            self._compiled_conditions[where_clause] = compiled
+        return compiled
+    
+    def _compile_conditions(self, where_clause: str
+                            ) -> Tuple[Callable[..., bool], Tuple[str, ...]]:
+        """Compile a WHERE clause into a predicate over a row and the placeholder values
+        
+        Also returns the field each placeholder is compared with.
+        """
+        namespace = {'__builtins__': {}, '_NO_MATCH': _NO_MATCH}
+        placeholder_fields = []
+        alternatives = []
+        for group in self._parse_where(where_clause):
+            terms = []
+            for field, op, value in group:
+                comparison = f"(_x := row.get({field!r})) is not None and _x {_PYTHON_OPS[op]} "
+                if isinstance(value, _Placeholder):
+                    # Placeholder values are passed in per call, already cast
+                    placeholder_fields.append(field)
+                    slot = f"_p[{value.index}]"
+                    terms.append(f"({slot} is not _NO_MATCH and {comparison}{slot})")
+                    continue
+                
+                try:
+                    literal = self._cast_literal(field, value)
+                except (ValueError, TypeError):
+                    # The literal can never match a value of this column
+                    terms.append('False')
+                    continue
+                
+                # Literals are bound by name so no value has to round-trip through repr
+                name = f"_v{len(namespace)}"
+                namespace[name] = literal
+                terms.append(f"({comparison}{name})")
+            alternatives.append("(" + " and ".join(terms) + ")")
+        
+        predicate = eval("lambda row, _p=(): " + " or ".join(alternatives), namespace)
+        return predicate, tuple(placeholder_fields)
+    
+    @property
+    def data(self) -> Sequence[Dict[str, Any]]:
+        """The table's rows as dictionaries, materialized on access"""
+        return _TableRows(self)
+    
+    def _rows(self, row_ids: Optional[Sequence[int]] = None,
+              columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Materialize rows from the column store
+        
+        Takes all rows if row_ids is None, and only the given columns if any are
+        passed (columns the table does not have come out as None).
+        """
+        names = tuple(self._columns) if columns is None else tuple(columns)
+        if not names:
+            return []
+        
+        count = self._n_rows if row_ids is None else len(row_ids)
+        values = [
+            self._columns[name].take(row_ids) if name in self._columns else [None] * count
+            for name in names
+        ]
+        return list(map(self._row_maker(names), *values))
+    
+    def _row_maker(self, names: Tuple[str, ...]) -> Callable[..., Dict[str, Any]]:
+        """Function building a row dict out of one value per named column
+        
+        A compiled dict display is much cheaper per row than dict(zip(...)).
+        """
+        make_row = self._row_makers.get(names)
+        if make_row is None:
+            if len(self._row_makers) >= 256:
+                self._row_makers.clear()
+            params = ", ".join(f"_{i}" for i in range(len(names)))
+            items = ", ".join(f"{name!r}: _{i}" for i, name in enumerate(names))
+            make_row = eval(f"lambda {params}: {{{items}}}", {'__builtins__': {}})
+            self._row_makers[names] = make_row
+        return make_row
     
     def _validate_columns(self):
         """Validate column definitions"""
@@ -35,24 +349,33 @@ class Table:
         # Validate data types
         valid_types = {"string", "integer", "float", "boolean", "datetime"}
         for col in self.columns:
-            if col.data_type.lower() not in valid_types:
+            if col.data_type not in valid_types:
                 raise ValueError(f"Invalid data type for column {col.name}: {col.data_type}")
     
-    def create_index(self, column_name: str) -> None:
-        """Create a B-tree index for a column"""
-        if column_name not in {col.name for col in self.columns}:
-            raise ValueError(f"Column {column_name} does not exist")
+    def create_index(self, column_name: str, kind: str = "btree") -> None:
+        """Create an index for a column
         
-        # Create new index
-        index = BTreeIndex()
+        A "btree" index serves both equality and range lookups; a "hash" index
+        only serves equality lookups, but answers them without a tree descent.
+        """
+        if column_name not in self._column_by_name:
+            raise ValueError(f"Column {column_name} does not exist")
         
-        # Build index from existing data
-        for row_id, row in enumerate(self.data):
-            if column_name in row:
-                index.insert(row[column_name], row_id)
+        # Create new index and build it from existing data
+        if kind == "btree":
+            index = BTreeIndex()
+        elif kind == "hash":
+            index = HashIndex()
+        else:
+            raise ValueError(f"Invalid index kind: {kind}")
+        index.bulk_load(self._index_pairs(column_name))
         
         self._indexes[column_name] = index
     
+    def _index_pairs(self, column_name: str) -> List[Tuple[Any, int]]:
+        """Collect (value, row_id) pairs of a column for bulk-loading an index"""
+        return list(zip(self._columns[column_name].take(), range(self._n_rows)))
+    
     def batch_insert(self, rows: List[Dict[str, Any]]) -> bool:
         """Efficiently insert multiple rows with index updates"""
         # Pre-validate all rows
@@ -60,59 +383,118 @@ class Table:
         unique_values = defaultdict(set)
         
         # Check unique constraints across all new rows
+        converters = self._converters
         for row in rows:
             converted_row = {}
             # Validate required columns and defaults
-            for column in self.columns:
-                if not column.nullable and column.name not in row and column.default is None:
-                    raise ValueError(f"Required column {column.name} is missing")
+            for name, convert, nullable, default, unique in converters:
+                if not nullable and default is None and name not in row:
+                    raise ValueError(f"Required column {name} is missing")
                 
-                value = row.get(column.name, column.default)
+                value = row.get(name, default)
                 
                 # Type conversion
                 if value is not None:
                     try:
-                        if column.data_type == "integer":
-                            value = int(value)
-                        elif column.data_type == "float":
-                            value = float(value)
-                        elif column.data_type == "boolean":
-                            value = bool(value)
-                        else:  # string and datetime
-                            value = str(value)
+                        value = convert(value)
                     except (ValueError, TypeError):
-                        raise ValueError(f"Invalid value for column {column.name}: {value}")
+                        raise ValueError(f"Invalid value for column {name}: {value}")
                 
-                converted_row[column.name] = value
+                converted_row[name] = value
                 
                 # Track unique values
-                if column.unique and value is not None:
-                    if value in unique_values[column.name] or value in self._unique_indexes[column.name]:
-                        raise ValueError(f"Unique constraint violated for column {column.name}")
-                    unique_values[column.name].add(value)
+                if unique and value is not None:
+                    if value in unique_values[name] or value in self._unique_indexes[name]:
+                        raise ValueError(f"Unique constraint violated for column {name}")
+                    unique_values[name].add(value)
             
             validated_rows.append(converted_row)
         
         # All rows validated, perform batch insert
-        start_id = len(self.data)
-        for i, row in enumerate(validated_rows):
-            row_id = start_id + i
-            
-            # Update indexes
-            for column_name, index in self._indexes.items():
-                if column_name in row:
-                    index.insert(row[column_name], row_id)
-            
-            # Update unique indexes
-            for column in self.columns:
-                if column.unique:
-                    value = row.get(column.name)
+        columns = {
+            column_name: [row[column_name] for row in validated_rows]
+            for column_name in self._columns
+        }
+        self._append_columns(columns, len(validated_rows))
+        return True
+    
+    def batch_insert_columnar(self, columns: Dict[str, Sequence[Any]]) -> bool:
+        """Insert a batch given as one sequence of values per column
+        
+        NumPy arrays whose dtype already matches the column are stored without
+        converting value by value.
+        """
+        unknown = set(columns) - set(self._columns)
+        if unknown:
+            raise ValueError(f"Column {sorted(unknown)[0]} does not exist")
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns of a batch must have the same length")
+        n = lengths.pop() if lengths else 0
+        
+        validated = {}
+        for name, convert, nullable, default, unique in self._converters:
+            values = columns.get(name)
+            if values is None:
+                if not nullable and default is None:
+                    raise ValueError(f"Required column {name} is missing")
+                # Converted once, as batch_insert converts it for every row
+                if default is not None:
+                    try:
+                        default = convert(default)
+                    except (ValueError, TypeError):
+                        raise ValueError(f"Invalid value for column {name}: {default}")
+                values = [default] * n
+            elif not (isinstance(values, np.ndarray) and values.dtype == self._columns[name].dtype
+                      and values.dtype != object):
+                # Type conversion
+                if isinstance(values, np.ndarray):
+                    values = values.tolist()
+                converted = []
+                for value in values:
                     if value is not None:
-                        self._unique_indexes[column.name][value] = row_id
+                        try:
+                            value = convert(value)
+                        except (ValueError, TypeError):
+                            raise ValueError(f"Invalid value for column {name}: {value}")
+                    converted.append(value)
+                values = converted
+            validated[name] = values
             
-            self.data.append(row)
+            # Check unique constraints across existing and new values
+            if unique:
+                seen = self._unique_indexes[name]
+                new_values = [value for value in self._python_values(values) if value is not None]
+                if len(set(new_values)) != len(new_values) or any(value in seen for value in new_values):
+                    raise ValueError(f"Unique constraint violated for column {name}")
         
+        self._append_columns(validated, n)
         return True
+    
+    @staticmethod
+    def _python_values(values: Sequence[Any]) -> List[Any]:
+        """Values as a list of Python objects, unboxing NumPy arrays"""
+        return values.tolist() if isinstance(values, np.ndarray) else values
+    
+    def _append_columns(self, columns: Dict[str, Sequence[Any]], n: int) -> None:
+        """Append n validated values per column and update the indexes"""
+        start_id = self._n_rows
+        row_ids = range(start_id, start_id + n)
+        for column_name, column_array in self._columns.items():
+            column_array.extend(columns[column_name])
+        self._n_rows += n
+        
+        # Update indexes, one batch per index
+        for column_name, index in self._indexes.items():
+            index.bulk_insert(self._python_values(columns[column_name]), row_ids)
+        
+        # Update unique indexes
+        for column in self._unique_columns:
+            self._unique_indexes[column.name].update(
+                (value, row_id)
+                for value, row_id in zip(self._python_values(columns[column.name]), row_ids)
+                if value is not None
+            )
 
     def insert(self, row: Dict[str, Any]) -> bool:
         """Insert a single row (now uses batch_insert)"""
@@ -132,7 +514,7 @@ class Table:
                 }
                 for col in self.columns
             ],
-            "data": self.data
+            "data": self._rows()
         }
 
     @classmethod
@@ -143,7 +525,10 @@ class Table:
             for col_data in data["columns"]
         ]
         table = cls(data["name"], columns)
-        table.data = data["data"]
+        rows = data["data"]
+        for column_name, column_array in table._columns.items():
+            column_array.extend([row.get(column_name) for row in rows])
+        table._n_rows = len(rows)
         return table
 
     def _validate_type(self, value: Any, expected_type: str) -> bool:
@@ -172,20 +557,33 @@ class Table:
         
         return True
     
-    def find_by_index(self, column_name: str, value: Any) -> List[Dict[str, Any]]:
+    def scan_columnar(self, column_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Views of a column's stored values and of its non-NULL mask
+        
+        No row is materialized; NULL slots of the values hold a placeholder.
+        """
+        if column_name not in self._columns:
+            raise ValueError(f"Column {column_name} does not exist")
+        
+        column_array = self._columns[column_name]
+        return column_array.values, column_array.valid
+    
+    def find_by_index(self, column_name: str, value: Any) -> List[RowView]:
         """Find rows using an index"""
         if column_name not in self._indexes:
             raise ValueError(f"No index exists for column {column_name}")
         
         index = self._indexes[column_name]
         row_ids = index.search(value)
-        return [self.data[row_id] for row_id in row_ids]
+        return [RowView(self._columns, row_id) for row_id in row_ids]
     
-    def range_search(self, column_name: str, start_value: Any, end_value: Any) -> List[Dict[str, Any]]:
+    def range_search(self, column_name: str, start_value: Any, end_value: Any) -> List[RowView]:
         """Perform a range search using an index"""
         if column_name not in self._indexes:
             raise ValueError(f"No index exists for column {column_name}")
         
         index = self._indexes[column_name]
+        if not isinstance(index, BTreeIndex):
+            raise ValueError(f"Index on column {column_name} does not support range search")
         row_ids = index.range_search(start_value, end_value)
-        return [self.data[row_id] for row_id in row_ids]
\ No newline at end of file
+        return [RowView(self._columns, row_id) for row_id in row_ids]
\ No newline at end of file
@@ -0,0 +1,3 @@
+from .manager import TransactionState, Transaction, TransactionManager
+
+__all__ = ['TransactionState', 'Transaction', 'TransactionManager']
@@ -1,7 +1,10 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set
 from enum import Enum
+import os
+import itertools
 import threading
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 
 class TransactionState(Enum):
     ACTIVE = "ACTIVE"
@@ -9,55 +12,110 @@ class TransactionState(Enum):
     ROLLED_BACK = "ROLLED_BACK"
 
 class Transaction:
+    __slots__ = ('id', 'state', 'changes', 'locks', 'timestamp')
+
     def __init__(self, id: str):
         self.id = id
         self.state = TransactionState.ACTIVE
-        self.changes: List[Dict[str, Any]] = []
-        self.locks = set()
-        self.timestamp = datetime.utcnow()
+        self.changes: List[Dict[str, Any]] = []  # List of changes made during transaction
+        self.locks: Set[str] = set()  # Set of table names that are locked
+        self.timestamp = time.time_ns()  # Start time in nanoseconds since the epoch
+
+    @property
+    def start_time(self) -> float:
+        """Start time in seconds since the epoch"""
+        return self.timestamp / 1e9
+
+    @property
+    def started_at(self) -> datetime:
+        """Start time as a naive UTC datetime, like the utcnow() it replaces"""
+        started = datetime.fromtimestamp(self.timestamp / 1e9, tz=timezone.utc)
+        return started.replace(tzinfo=None)
 
 class TransactionManager:
-    def __init__(self):
-        self.transactions: Dict[str, Transaction] = {}
-        self.lock = threading.Lock()
-    
+    def __init__(self, num_shards: int = 16):
+        # Transactions are spread over shards by ID, each with its own lock, so
+        # unrelated transactions do not serialize on a single lock
+        self._shards: List[Dict[str, Transaction]] = [{} for _ in range(num_shards)]
+        self._shard_locks = [threading.Lock() for _ in range(num_shards)]
+        # IDs are a counter behind a random per-manager token, so they stay
+        # unique across processes without drawing random bytes per transaction
+        self._id_prefix = os.urandom(4).hex() + "-"
+        self._next_id = itertools.count(1)  # next() on a count is atomic in CPython
+
+    @property
+    def transactions(self) -> Dict[str, Transaction]:
+        """Snapshot of all transactions by ID"""
+        transactions: Dict[str, Transaction] = {}
+        for shard in self._shards:
+            transactions.update(shard)
+        return transactions
+
+    def _shard_index(self, tx_id: str) -> int:
+        """Shard holding a transaction ID"""
+        return hash(tx_id) % len(self._shards)
+
     def begin_transaction(self) -> str:
         """Start a new transaction"""
-        with self.lock:
-            tx_id = str(len(self.transactions) + 1)
-            self.transactions[tx_id] = Transaction(tx_id)
-            return tx_id
-    
-    def commit(self, tx_id: str):
+        tx_id = self._id_prefix + str(next(self._next_id))
+        tx = Transaction(tx_id)
+        shard_index = self._shard_index(tx_id)
+        with self._shard_locks[shard_index]:
+            self._shards[shard_index][tx_id] = tx
+        return tx_id
+
+    def commit(self, tx_id: str) -> bool:
         """Commit a transaction"""
-        with self.lock:
-            if tx_id not in self.transactions:
+        shard_index = self._shard_index(tx_id)
+        with self._shard_locks[shard_index]:
+            tx = self._shards[shard_index].get(tx_id)
+            if tx is None:
                 raise ValueError(f"Transaction {tx_id} not found")
-            
-            tx = self.transactions[tx_id]
-            if tx.state != TransactionState.ACTIVE:
+
+            if tx.state is not TransactionState.ACTIVE:
                 raise ValueError(f"Transaction {tx_id} is not active")
-            
+
             # Apply changes
             self._apply_changes(tx)
             tx.state = TransactionState.COMMITTED
-    
-    def rollback(self, tx_id: str):
+
+            # Release locks
+            tx.locks.clear()
+
+            return True
+
+    def rollback(self, tx_id: str) -> bool:
         """Rollback a transaction"""
-        with self.lock:
-            if tx_id not in self.transactions:
+        shard_index = self._shard_index(tx_id)
+        with self._shard_locks[shard_index]:
+            tx = self._shards[shard_index].get(tx_id)
+            if tx is None:
                 raise ValueError(f"Transaction {tx_id} not found")
-            
-            tx = self.transactions[tx_id]
-            if tx.state != TransactionState.ACTIVE:
+
+            if tx.state is not TransactionState.ACTIVE:
                 raise ValueError(f"Transaction {tx_id} is not active")
-            
+
             # Discard changes
             tx.changes.clear()
             tx.state = TransactionState.ROLLED_BACK
-    
+
+            # Release locks
+            tx.locks.clear()
+
+            return True
+
+    def get_transaction(self, tx_id: str) -> Optional[Transaction]:
+        """Get transaction by ID"""
+        # A single dict lookup is atomic, so reads need no lock
+        return self._shards[self._shard_index(tx_id)].get(tx_id)
+
+    def is_active(self, tx_id: str) -> bool:
+        """Check if a transaction is active"""
+        tx = self.get_transaction(tx_id)
+        return tx is not None and tx.state is TransactionState.ACTIVE
+
     def _apply_changes(self, transaction: Transaction):
         """Apply transaction changes"""
         for change in transaction.changes:
             # Implementation of applying changes
-            pass
\ No newline at end of file
+            pass
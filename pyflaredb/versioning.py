@@ -1,9 +1,38 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from bisect import bisect_right
+from collections import defaultdict
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional
+import hashlib
+import json
 
+# The one encoder of version payloads: compact, with sorted keys
+_dumps = partial(json.dumps, default=str, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
-@dataclass
+
+def _serialize(payload: List[Any]) -> bytes:
+    """Canonical JSON encoding of a version payload, so a history always hashes the same"""
+    try:
+        return _dumps(payload).encode()
+    except TypeError:
+        # Keys of mixed or unsupported types: sort them as the strings they are written as
+        return _dumps(_string_keys(payload)).encode()
+
+
+def _string_keys(value: Any) -> Any:
+    """Copy of a JSON value with every dict key converted the way json writes it"""
+    if isinstance(value, dict):
+        return {
+            (key if isinstance(key, str) else json.dumps(key, default=str).strip('"')): _string_keys(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_string_keys(item) for item in value]
+    return value
+
+
+@dataclass(slots=True)
 class Version:
     timestamp: datetime
     operation: str  # 'INSERT', 'UPDATE', 'DELETE'
@@ -13,10 +42,48 @@ class Version:
     previous_version: Optional[str] = None  # Hash of previous version
 
 
+class _TableReplay:
+    """Rows of one table rebuilt by applying its versions in order"""
+
+    def __init__(self, versions: Iterable[Version] = ()):
+        self._rows: List[Optional[Dict[str, Any]]] = []  # None marks a deleted row
+        self._positions: Dict[Any, List[int]] = defaultdict(list)  # Row "id" -> positions
+        for version in versions:
+            self.apply(version)
+
+    def apply(self, version: Version):
+        """Apply one INSERT, UPDATE or DELETE"""
+        if version.operation == "INSERT":
+            self._positions[version.data.get("id")].append(len(self._rows))
+            self._rows.append(version.data)
+        elif version.operation == "DELETE":
+            for position in self._positions.pop(version.row_id, ()):
+                self._rows[position] = None
+        elif version.operation == "UPDATE":
+            positions = self._positions.pop(version.row_id, [])
+            for position in positions:
+                self._rows[position] = version.data
+            if positions:
+                # The new data may carry a different id
+                self._positions[version.data.get("id")].extend(positions)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Current rows in insertion order"""
+        return [row for row in self._rows if row is not None]
+
+
 class VersionStore:
     def __init__(self):
         self.versions: List[Version] = []
         self.current_version: str = None  # Hash of current version
+        self._last_digest = b""  # Raw digest of the current version, keys the next hash
+        # Versions and their timestamps per table, in insertion order
+        self._by_table: Dict[str, List[Version]] = defaultdict(list)
+        self._timestamps_by_table: Dict[str, List[datetime]] = defaultdict(list)
+        # Tables whose versions did not arrive in timestamp order
+        self._unordered_tables = set()
+        # State of each table after all of its versions
+        self._latest: Dict[str, _TableReplay] = defaultdict(_TableReplay)
 
     def add_version(self, version: Version):
         """Add a new version to the store"""
@@ -24,27 +91,47 @@ class VersionStore:
         self.versions.append(version)
         self.current_version = version_hash
 
+        table_name = version.table_name
+        timestamps = self._timestamps_by_table[table_name]
+        if timestamps and version.timestamp < timestamps[-1]:
+            self._unordered_tables.add(table_name)
+        self._by_table[table_name].append(version)
+        timestamps.append(version.timestamp)
+        self._latest[table_name].apply(version)
+
+    def _calculate_hash(self, version: Version) -> str:
+        """Hash a version, chained to the one before it"""
+        payload = [
+            version.timestamp.isoformat(),
+            version.operation,
+            version.table_name,
+            version.row_id,
+            version.data,
+            version.previous_version,
+        ]
+        # Keying with the previous digest chains the versions without hashing
+        # the whole history again
+        hasher = hashlib.blake2b(_serialize(payload), digest_size=16, key=self._last_digest)
+        self._last_digest = hasher.digest()
+        return hasher.hexdigest()
+
     def get_state_at(self, timestamp: datetime) -> Dict[str, List[Dict[str, Any]]]:
         """Reconstruct database state at given timestamp"""
         state = {}
-        relevant_versions = [v for v in self.versions if v.timestamp <= timestamp]
-
-        for version in relevant_versions:
-            if version.table_name not in state:
-                state[version.table_name] = []
-
-            if version.operation == "INSERT":
-                state[version.table_name].append(version.data)
-            elif version.operation == "DELETE":
-                state[version.table_name] = [
-                    row
-                    for row in state[version.table_name]
-                    if row["id"] != version.row_id
-                ]
-            elif version.operation == "UPDATE":
-                state[version.table_name] = [
-                    version.data if row["id"] == version.row_id else row
-                    for row in state[version.table_name]
-                ]
+        for table_name, versions in self._by_table.items():
+            timestamps = self._timestamps_by_table[table_name]
+            if table_name in self._unordered_tables:
+                # Out-of-order timestamps: filter instead of bisecting
+                relevant_versions = [v for v in versions if v.timestamp <= timestamp]
+                if relevant_versions:
+                    state[table_name] = _TableReplay(relevant_versions).rows()
+                continue
+
+            count = bisect_right(timestamps, timestamp)
+            if count == len(versions):
+                # Snapshot at or after the latest version needs no replay
+                state[table_name] = self._latest[table_name].rows()
+            elif count:
+                state[table_name] = _TableReplay(versions[:count]).rows()
 
         return state
@@ -1,50 +1,243 @@
 from pyflaredb.core import PyFlareDB
 from pyflaredb.table import Column, Table
 from pyflaredb.benchmark.suite import BenchmarkSuite
+import argparse
+import hashlib
+import inspect
+import os
+import sys
+import tempfile
 import time
+import tracemalloc
 from datetime import datetime
+from statistics import median
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import random
 import string
-import json
-from typing import List, Dict, Any
+import numpy as np
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
 
 
-def generate_realistic_data(n: int) -> List[Dict[str, Any]]:
-    """Generate realistic test data"""
-    domains = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'company.com']
-    cities = ['New York', 'London', 'Tokyo', 'Paris', 'Berlin', 'Sydney', 'Toronto']
+# Value pools of the generated data, built once at import
+DOMAINS = ('gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'company.com')
+CITIES = ('New York', 'London', 'Tokyo', 'Paris', 'Berlin', 'Sydney', 'Toronto')
+THEMES = ("light", "dark", "system")
+_POOL = np.frombuffer((string.ascii_lowercase + string.digits).encode(), dtype="u1")
+_LETTERS = len(string.ascii_lowercase)  # The first entries of _POOL are letters
+# Records per generated chunk; together with the seed it fixes the data
+CHUNK_RECORDS = 1024
+# Saved benchmark datasets, outside the source tree
+BENCH_CACHE_DIR = os.path.join(tempfile.gettempdir(), "pyflaredb-bench")
+# Smaller datasets are generated faster than worker processes start up
+PARALLEL_MIN_RECORDS = 200_000
+META_TMPL = (
+    '{{"city":"{city}","last_login":"2024-{m:02d}-{d:02d}",'
+    '"preferences":{{"theme":"{theme}","notifications":{notif}}}}}'
+)
+
+
+def _gen_numeric_columns(n: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Typed age, score, is_active and login_count columns of n records"""
+    ages = rng.integers(18, 81, size=n)
+    scores = rng.integers(0, 10001, size=n) / 100.0  # Two decimals, without rounding floats
+    is_active = rng.random(n) > 0.1  # 90% active users
+    login_counts = rng.integers(1, 1001, size=n)
+    return ages, scores, is_active, login_counts
+
+
+def _gen_chunk(n: int, seed: np.random.SeedSequence, start: int = 0) -> Dict[str, np.ndarray]:
+    """Generate n records with ids counting from start, drawn from a generator seeded with seed"""
+    # Generator local to the chunk, so chunks can be drawn in any process
+    rng = np.random.default_rng(seed)
+    integers = rng.integers
     
-    data = []
-    for i in range(n):
-        # Generate realistic username
-        username = f"{random.choice(string.ascii_lowercase)}{random.choice(string.ascii_lowercase)}"
-        username += ''.join(random.choices(string.ascii_lowercase + string.digits, k=random.randint(6, 12)))
-        
-        # Generate realistic email
-        email = f"{username}@{random.choice(domains)}"
-        
-        # Generate JSON metadata
-        metadata = {
-            "city": random.choice(cities),
-            "last_login": f"2024-{random.randint(1,12):02d}-{random.randint(1,28):02d}",
-            "preferences": {
-                "theme": random.choice(["light", "dark", "system"]),
-                "notifications": random.choice([True, False])
-            }
-        }
-        
-        data.append({
-            "id": f"usr_{i:08d}",
-            "username": username,
-            "email": email,
-            "age": random.randint(18, 80),
-            "score": round(random.uniform(0, 100), 2),
-            "is_active": random.random() > 0.1,  # 90% active users
-            "login_count": random.randint(1, 1000),
-            "metadata": json.dumps(metadata)
-        })
+    def choices(pool):
+        return rng.choice(pool, size=n).tolist()
     
-    return data
+    # Draw every column in bulk instead of value by value
+    # Realistic usernames: two letters, then 6-12 letters or digits
+    name_chars = integers(0, len(_POOL), size=(n, 14))
+    name_chars[:, :2] = integers(0, _LETTERS, size=(n, 2))
+    name_lengths = 2 + integers(6, 13, size=n)
+    names = _POOL[name_chars].view("S14").ravel().tolist()
+    usernames = [name[:length].decode() for name, length in zip(names, name_lengths.tolist())]
+    
+    # Realistic emails
+    emails = [f"{username}@{domain}" for username, domain in zip(usernames, choices(DOMAINS))]
+    
+    # JSON metadata, formatted straight into its serialized form; every value
+    # comes from a fixed pool, so none needs escaping
+    metadata = [
+        META_TMPL.format(city=city, m=month, d=day, theme=theme, notif=notifications)
+        for city, month, day, theme, notifications in zip(
+            choices(CITIES),
+            integers(1, 13, size=n).tolist(),
+            integers(1, 29, size=n).tolist(),
+            choices(THEMES),
+            np.where(rng.random(n) < 0.5, "true", "false").tolist(),
+        )
+    ]
+    
+    ages, scores, is_active, login_counts = _gen_numeric_columns(n, rng)
+    return {
+        "id": np.char.mod("usr_%08d", np.arange(start, start + n)),  # Widens past 8 digits
+        "username": np.array(usernames, dtype=object),
+        "email": np.array(emails, dtype=object),
+        "age": ages,
+        "score": scores,
+        "is_active": is_active,
+        "login_count": login_counts,
+        "metadata": np.array(metadata, dtype=object)
+    }
+
+
+def _chunk_plan(n: int, chunk: int, seed: int = None,
+                first_id: int = 0) -> List[Tuple[int, np.random.SeedSequence, int]]:
+    """(size, seed, first id) of each chunk of n records with ids counting from first_id
+    
+    The seed of a chunk only depends on the dataset seed and the chunk index.
+    Without a dataset seed, one is drawn from np.random, so seeding it makes
+    the data reproducible too.
+    """
+    if seed is None:
+        seed = int(np.random.randint(2**31))
+    starts = range(0, n, chunk)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    return [
+        (min(chunk, n - start), chunk_seed, first_id + start)
+        for start, chunk_seed in zip(starts, seeds)
+    ]
+
+
+def iter_realistic_data(n: int, chunk: int = CHUNK_RECORDS, seed: int = None,
+                        first_id: int = 0) -> Iterator[Dict[str, np.ndarray]]:
+    """Generate n realistic records as a stream of column batches of up to chunk records
+    
+    Only one batch is held at a time, so loaders can insert any number of
+    records with a bounded working set. The same seed and chunk size always
+    give the same records.
+    """
+    for size, chunk_seed, start in _chunk_plan(n, chunk, seed, first_id):
+        yield _gen_chunk(size, chunk_seed, start)
+
+
+def _collect_chunks(chunks: Iterable[Dict[str, np.ndarray]], n: int) -> Dict[str, np.ndarray]:
+    """Copy a stream of column batches into one preallocated array per column"""
+    columns = {}
+    pos = 0
+    for chunk in chunks:
+        size = 0
+        for name, values in chunk.items():
+            size = len(values)
+            if name not in columns:
+                columns[name] = np.empty(n, dtype=values.dtype)
+            elif np.result_type(columns[name], values) != columns[name].dtype:
+                # Wider fixed-width strings further on
+                columns[name] = columns[name].astype(np.result_type(columns[name], values))
+            columns[name][pos:pos + size] = values
+        pos += size
+    return columns
+
+
+def generate_realistic_data(n: int, workers: int = None, seed: int = None,
+                            first_id: int = 0) -> Dict[str, np.ndarray]:
+    """Generate realistic test data as one array per column
+    
+    Records are drawn in chunks of CHUNK_RECORDS, each seeded from the dataset
+    seed and its index only, so a seed gives the same data on any machine.
+    At least PARALLEL_MIN_RECORDS records are generated on a pool of worker
+    processes (one per CPU by default).
+    """
+    workers = workers or os.cpu_count() or 1
+    if n < PARALLEL_MIN_RECORDS or workers == 1:
+        return _collect_chunks(iter_realistic_data(n, seed=seed, first_id=first_id), n)
+    
+    plan = _chunk_plan(n, CHUNK_RECORDS, seed, first_id)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = pool.map(_gen_chunk, *zip(*plan), chunksize=max(1, len(plan) // (4 * workers)))
+        return _collect_chunks(chunks, n)
+
+
+def _generator_version() -> str:
+    """Digest of the generator code and value pools; changing either invalidates cached data"""
+    sources = [inspect.getsource(fn) for fn in (_gen_numeric_columns, _gen_chunk, _chunk_plan)]
+    sources.append(repr((DOMAINS, CITIES, THEMES, META_TMPL, CHUNK_RECORDS, np.__version__)))
+    return hashlib.blake2b("\0".join(sources).encode(), digest_size=8).hexdigest()
+
+
+def iter_cached_realistic_data(n: int, seed: int, first_id: int = 0,
+                               cache_dir: str = BENCH_CACHE_DIR) -> Iterator[Dict[str, np.ndarray]]:
+    """iter_realistic_data(n, seed=seed, first_id=first_id), cached batch by batch
+    
+    Each batch is saved under cache_dir on first use and loaded afterwards.
+    The cache is keyed by the generator version, so it never serves data of
+    an older generator.
+    """
+    directory = os.path.join(cache_dir, f"{_generator_version()}-{seed:x}-{first_id}")
+    os.makedirs(directory, exist_ok=True)
+    for index, (size, chunk_seed, start) in enumerate(_chunk_plan(n, CHUNK_RECORDS, seed, first_id)):
+        path = os.path.join(directory, f"chunk_{index}_{size}.npz")
+        if os.path.exists(path):
+            with np.load(path) as saved:
+                yield {name: saved[name] for name in saved.files}
+            continue
+        
+        columns = _gen_chunk(size, chunk_seed, start)
+        # Store strings as fixed-width unicode, so loading needs no pickle;
+        # write to a temporary file first so an interrupted run leaves no partial chunk
+        with open(path + ".tmp", "wb") as f:
+            np.savez(f, **{
+                name: values.astype(str) if values.dtype == object else values
+                for name, values in columns.items()
+            })
+        os.replace(path + ".tmp", path)
+        yield columns
+
+
+def to_rows(columns: Dict[str, np.ndarray], start: int = 0, stop: int = None) -> List[Dict[str, Any]]:
+    """Rows start:stop of a column-wise dataset, as dictionaries"""
+    names = list(columns)
+    values = [columns[name][start:stop].tolist() for name in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def slice_columns(columns: Dict[str, np.ndarray], start: int = 0, stop: int = None) -> Dict[str, np.ndarray]:
+    """Rows start:stop of a column-wise dataset, still column-wise"""
+    return {name: values[start:stop] for name, values in columns.items()}
+
+
+# Parameterized INSERT for one users record
+USER_COLUMNS = ("id", "username", "email", "age", "score", "is_active", "login_count", "metadata")
+INSERT_USER_SQL = (
+    f"INSERT INTO users ({', '.join(USER_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in USER_COLUMNS)})"
+)
+
+
+def user_params(record: Dict[str, Any]) -> tuple:
+    """Parameters of INSERT_USER_SQL for one record"""
+    return tuple(record[col] for col in USER_COLUMNS)
+
+
+# Seed of the test data generators, unless --seed is given
+DEFAULT_SEED = 0xDB
+
+# First id of the benchmark records, past every id of the feature tests
+BENCH_FIRST_ID = 1_000_000
+
+# Client threads submitting the mixed workload
+MIXED_WORKERS = 8
+
+# Cold runs (each after a cache flush) and warm runs per OLTP query
+COLD_RUNS = 5
+WARM_RUNS = 20
+
+
+def time_call(fn, *args) -> float:
+    """Seconds taken by one call, measured with the monotonic performance counter"""
+    start_ns = time.perf_counter_ns()
+    fn(*args)
+    return (time.perf_counter_ns() - start_ns) / 1e9
 
 
 def format_value(value):
@@ -54,9 +247,16 @@ def format_value(value):
     return str(value)
 
 
-def test_database_features():
-    """Test all database features with realistic workloads"""
+def test_database_features(seed: int = DEFAULT_SEED):
+    """Test all database features with realistic workloads
+    
+    All test data is drawn from generators seeded with seed. Timings of the
+    cache and of selective queries are only comparable between runs with the
+    same seed.
+    """
     print("\n=== Starting Realistic Database Tests ===")
+    random.seed(seed)
+    np.random.seed(seed)
     
     # Initialize database
     db = PyFlareDB("test.db")
@@ -92,39 +292,20 @@ def test_database_features():
     # Insert Performance (Single vs Batch)
     print("\nInsert Performance:")
     
-    # Single Insert (OLTP-style)
-    start_time = time.time()
-    for record in test_data[:100]:  # Test with first 100 records
-        # Properly escape the metadata string
-        metadata_str = record['metadata'].replace("'", "''")
-        
-        # Format each value according to its type
-        values = [
-            f"'{record['id']}'",                    # string
-            f"'{record['username']}'",              # string
-            f"'{record['email']}'",                 # string
-            str(record['age']),                     # integer
-            str(record['score']),                   # float
-            str(record['is_active']).lower(),       # boolean
-            str(record['login_count']),             # integer
-            f"'{metadata_str}'"                     # string (JSON)
-        ]
-        
-        query = f"""
-        INSERT INTO users 
-            (id, username, email, age, score, is_active, login_count, metadata)
-        VALUES 
-            ({', '.join(values)})
-        """
-        db.execute(query)
-    single_insert_time = time.time() - start_time
+    # Single Insert (OLTP-style): one prepared INSERT, parsed once and
+    # executed for every record
+    insert_user = db.prepare(INSERT_USER_SQL)
+    insert_params = [user_params(record) for record in to_rows(test_data, 0, 100)]  # Test with first 100 records
+    start_ns = time.perf_counter_ns()
+    insert_user.executemany(insert_params)
+    single_insert_time = (time.perf_counter_ns() - start_ns) / 1e9
     print(f"Single Insert (100 records, OLTP): {single_insert_time:.4f}s")
     
     # Batch Insert (OLAP-style)
-    start_time = time.time()
-    batch_data = test_data[100:200]  # Next 100 records
-    users_table.batch_insert(batch_data)  # This should work as is
-    batch_insert_time = time.time() - start_time
+    start_ns = time.perf_counter_ns()
+    batch_data = slice_columns(test_data, 100, 200)  # Next 100 records
+    users_table.batch_insert_columnar(batch_data)
+    batch_insert_time = (time.perf_counter_ns() - start_ns) / 1e9
     print(f"Batch Insert (100 records, OLAP): {batch_insert_time:.4f}s")
     
     # 3. Query Performance Tests
@@ -173,67 +354,97 @@ def test_database_features():
         """)
     ]
     
+    # Parse and plan the OLTP queries once, so the timings below only cover
+    # execution and the result cache
+    oltp_statements = [(query_name, db.prepare(query)) for query_name, query in oltp_queries]
+    
     print("\nOLTP Query Performance:")
-    for query_name, query in oltp_queries:
-        # First run (cold)
-        start_time = time.time()
-        db.execute(query)
-        cold_time = time.time() - start_time
+    for query_name, statement in oltp_statements:
+        # Cold runs start from empty caches, so earlier queries cannot warm them
+        cold_times = []
+        for _ in range(COLD_RUNS):
+            db.clear_caches()
+            cold_times.append(time_call(statement.execute))
         
-        # Second run (warm/cached)
-        start_time = time.time()
-        db.execute(query)
-        warm_time = time.time() - start_time
+        # Warm runs are answered from the result cache
+        warm_times = [time_call(statement.execute) for _ in range(WARM_RUNS)]
+        
+        # Compare the fastest runs, which are the least affected by noise
+        cold_time = min(cold_times)
+        warm_time = min(warm_times)
         
         print(f"\n{query_name}:")
-        print(f"  Cold run: {cold_time:.4f}s")
-        print(f"  Warm run: {warm_time:.4f}s")
+        print(f"  Cold run: min {cold_time:.6f}s, median {median(cold_times):.6f}s")
+        print(f"  Warm run: min {warm_time:.6f}s, median {median(warm_times):.6f}s")
         print(f"  Cache improvement: {((cold_time - warm_time) / cold_time * 100):.1f}%")
     
     print("\nOLAP Query Performance:")
     for query_name, query in olap_queries:
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         db.execute(query)
-        execution_time = time.time() - start_time
+        execution_time = (time.perf_counter_ns() - start_ns) / 1e9
         print(f"\n{query_name}: {execution_time:.4f}s")
     
     # 4. Concurrent Operations Test
     print("\nConcurrent Operations Simulation:")
-    start_time = time.time()
-    # Simulate mixed workload
-    for _ in range(100):
-        if random.random() < 0.8:  # 80% reads
-            query = random.choice(oltp_queries)[1]
-        else:  # 20% writes
-            record = generate_realistic_data(1)[0]
-            query = f"""
-            INSERT INTO users (id, username, email, age, score, is_active, login_count, metadata)
-            VALUES (
-                '{record['id']}',
-                '{record['username']}',
-                '{record['email']}',
-                {record['age']},
-                {record['score']},
-                {str(record['is_active']).lower()},
-                {record['login_count']},
-                '{record['metadata']}'
-            )
-            """
-        db.execute(query)
-    mixed_workload_time = time.time() - start_time
-    print(f"Mixed Workload (100 operations): {mixed_workload_time:.4f}s")
+    # Prepare the mixed workload (80% reads, 20% writes) before timing it
+    read_statements = tuple(statement for _, statement in oltp_statements)
+    reads = [(random.choice(read_statements), ()) for _ in range(80)]
+    new_users = generate_realistic_data(20, first_id=len(test_data["id"]))  # Ids after the test data's
+    writes = [(insert_user, user_params(record)) for record in to_rows(new_users)]
+    operations = reads + writes
+    random.shuffle(operations)
+    
+    statements, params = zip(*operations)
+    
+    # Submit the operations from a pool of client threads; the database runs
+    # one statement at a time, so this measures dispatch and lock overhead on
+    # top of the serial execution time
+    workers = min(MIXED_WORKERS, len(operations))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        start_ns = time.perf_counter_ns()
+        list(pool.map(lambda statement, values: statement.execute(values), statements, params))
+        mixed_workload_time = (time.perf_counter_ns() - start_ns) / 1e9
+    print(f"Mixed Workload (100 operations, {workers} threads): {mixed_workload_time:.4f}s")
     
     # 5. Memory Usage Test
     print("\nMemory Usage:")
-    import sys
-    memory_size = sys.getsizeof(db.tables["users"].data) / 1024  # KB
-    records_count = len(db.tables["users"].data)
-    print(f"Memory per record: {(memory_size / records_count):.2f} KB")
+    # tracemalloc only sees allocations made while it traces, and tracing the
+    # timed sections above would slow them down. So this measures a stand-in:
+    # a table with the same columns, row count and indexes as users, built
+    # from freshly generated data so every string it keeps is counted. It is
+    # an estimate of the users table's footprint, not a measurement of it.
+    records_count = len(users_table.data)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    fresh_data = generate_realistic_data(records_count)
+    table_copy = Table(name="users_copy", columns=users_table.columns)
+    table_copy.batch_insert_columnar(fresh_data)
+    for column_name in users_table._indexes:
+        table_copy.create_index(column_name)
+    del fresh_data  # Only count what the table keeps alive
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"Memory per record: {(after - before) / 1024 / records_count:.2f} KB")
+    
+    # Size of the row view object alone, without the rows it gives access to
+    container_size = sys.getsizeof(db.tables["users"].data) / 1024  # KB
+    print(f"Container overhead: {container_size:.2f} KB")
+    
+    # Value and NULL-mask buffers of the column store (string columns hold
+    # pointers to the string objects)
+    column_arrays = users_table._columns.values()
+    used = sum(array.values.nbytes + array.valid.nbytes for array in column_arrays)
+    allocated = sum(array._values.nbytes + array._valid.nbytes for array in column_arrays)
+    print(f"Column buffers: {used / 1024:.2f} KB used, {allocated / 1024:.2f} KB allocated")
     
     # 6. Run standard benchmark suite
     print("\n6. Running standard benchmark suite...")
-    benchmark = BenchmarkSuite(db)
-    results = benchmark.run_benchmark(num_records=10000)
+    benchmark = BenchmarkSuite(db, seed=seed)
+    # Streamed one batch at a time, each inserted as soon as it is loaded; the
+    # records share the users table, so their ids follow the test data's
+    benchmark_data = iter_cached_realistic_data(10000, seed, first_id=BENCH_FIRST_ID)
+    results = benchmark.run_benchmark(num_records=10000, data=benchmark_data)
     
     print("\nBenchmark Results:")
     for test_name, metrics in results.items():
@@ -242,9 +453,158 @@ def test_database_features():
             print(f"  {metric}: {format_value(value)}")
 
 
+def test_parameter_binding():
+    """Check that bound parameters are matched as values and never read as SQL"""
+    print("\n=== Parameter Binding Tests ===")
+    db = PyFlareDB("test.db")
+    db.create_table(Table(
+        name="users",
+        columns=[
+            Column("id", "string", nullable=False, primary_key=True),
+            Column("username", "string", nullable=False, unique=True),
+            Column("age", "integer", nullable=True),
+            Column("score", "float", nullable=True),
+            Column("active", "boolean", nullable=True),
+        ]
+    ))
+    db.executemany(
+        "INSERT INTO users (id, username, age, score, active) VALUES (?, ?, ?, ?, ?)",
+        [(f"usr_{i}", f"user{i}", 20 + i, i * 0.5, i % 2 == 0) for i in range(10)]
+    )
+    
+    # A quote-bearing string is stored and matched as one opaque value
+    quoted = "x' OR age > 0 OR username = 'y"
+    db.execute("INSERT INTO users (id, username, age) VALUES (?, ?, ?)", params=("usr_q", quoted, 99))
+    rows = db.execute("SELECT * FROM users WHERE username = ?", params=(quoted,))
+    assert [row["age"] for row in rows] == [99], rows
+    rows = db.execute("SELECT * FROM users WHERE username = ?", params=(quoted + "z",))
+    assert rows == [], rows
+    
+    # SQL in a parameter of a numeric condition matches nothing
+    rows = db.execute("SELECT * FROM users WHERE age > ?", params=("25 OR age < 100",))
+    assert rows == [], rows
+    
+    # NumPy scalars bind like the Python values they hold
+    rows = db.execute("SELECT * FROM users WHERE age > ?", params=(np.int64(27),))
+    assert sorted(row["age"] for row in rows) == [28, 29, 99], rows
+    
+    # A parameter selects the same rows as the literal it stands for
+    cases = [
+        ("age > ?", "25", 25), ("age > ?", "25", "25"), ("age > ?", "1.5", 1.5),
+        ("age = ?", "21", np.int64(21)), ("score >= ?", "2.5", 2.5),
+        ("score >= ?", "2", 2), ("score < ?", "2.5", "2.5"),
+        ("active = ?", "true", True), ("active = ?", "true", "true"),
+        ("active = ?", "false", "FALSE"), ("active = ?", "1", 1),
+        ("username = ?", "'user3'", "user3"),
+    ]
+    for where, literal, param in cases:
+        expected = db.execute(f"SELECT * FROM users WHERE {where.replace('?', literal)}")
+        rows = db.execute(f"SELECT * FROM users WHERE {where}", params=(param,))
+        assert sorted(row["id"] for row in rows) == sorted(row["id"] for row in expected), (
+            where, param, rows
+        )
+    
+    # Cached results are keyed on parameter values verbatim, whitespace included
+    db.execute("INSERT INTO users (id, username, age) VALUES (?, ?, ?)", params=("usr_s1", "a b", 1))
+    db.execute("INSERT INTO users (id, username, age) VALUES (?, ?, ?)", params=("usr_s2", "a  b", 2))
+    stmt = db.prepare("SELECT * FROM users WHERE username = ?")
+    assert [row["age"] for row in stmt.execute(("a b",))] == [1]
+    assert [row["age"] for row in stmt.execute(("a  b",))] == [2]
+    print("Parameter binding: OK")
+
+
+def test_query_caches():
+    """Check that cached results and compiled predicates follow the data they come from"""
+    print("\n=== Query Cache Tests ===")
+    db = PyFlareDB("test.db")
+    db.create_table(Table(
+        name="users",
+        columns=[
+            Column("id", "string", nullable=False, primary_key=True),
+            Column("username", "string", nullable=False, unique=True),
+            Column("age", "integer", nullable=True),
+            Column("active", "boolean", nullable=True),
+            Column("logins", "integer", nullable=True, default="0"),
+        ]
+    ))
+    db.create_table(Table(
+        name="orders",
+        columns=[
+            Column("id", "string", nullable=False, primary_key=True),
+            Column("amount", "float", nullable=True),
+        ]
+    ))
+    insert_user = db.prepare(
+        "INSERT INTO users (id, username, age, active) VALUES (?, ?, ?, ?)"
+    )
+    insert_user.executemany([(f"usr_{i}", f"user{i}", 20 + i, i % 2 == 0) for i in range(10)])
+    db.executemany(
+        "INSERT INTO orders (id, amount) VALUES (?, ?)",
+        [(f"ord_{i}", i * 1.5) for i in range(4)]
+    )
+    
+    # Prepared results are cached per parameter values; formatting variants of
+    # the statement share the entries
+    by_age = db.prepare("SELECT * FROM users WHERE age > ?")
+    first = by_age.execute((25,))
+    assert len(first) == 4, first
+    assert by_age.execute((25,)) is first
+    assert db.prepare("SELECT *  FROM users\n   WHERE age > ?").execute((25,)) is first
+    assert len(by_age.execute((26,))) == 3
+    
+    # executemany evicts the cached results of the table it writes, and only those
+    orders_total = db.execute("SELECT SUM(amount) AS total FROM orders")
+    assert orders_total == [{"total": 9.0}], orders_total
+    assert db.execute("SELECT COUNT(*) FROM users") == [{"count": 10}]
+    insert_user.executemany([(f"usr_{i}", f"user{i}", 20 + i, False) for i in range(10, 12)])
+    assert db.execute("SELECT COUNT(*) FROM users") == [{"count": 12}]
+    assert len(by_age.execute((25,))) == 6
+    assert db.execute("SELECT SUM(amount) AS total FROM orders") is orders_total
+    
+    # Column-store aggregates agree with the filtered rows
+    rows = db.execute("SELECT * FROM users WHERE age >= 22")
+    aggregates = db.execute(
+        "SELECT COUNT(*) AS n, AVG(age) AS mean_age, "
+        "SUM(CASE WHEN active THEN 1 ELSE 0 END) AS active_users FROM users WHERE age >= 22"
+    )
+    assert aggregates == [{
+        "n": len(rows),
+        "mean_age": sum(row["age"] for row in rows) / len(rows),
+        "active_users": sum(1 for row in rows if row["active"]),
+    }], aggregates
+    
+    # Hash indexes answer equality lookups
+    db.tables["users"].create_index("username", kind="hash")
+    rows = db.execute("SELECT * FROM users WHERE username = 'user3'")
+    assert [row["age"] for row in rows] == [23], rows
+    
+    # Both insert paths store the converted default of a missing column
+    db.bulk_insert_columnar("users", {
+        "id": np.array(["usr_c"], dtype=object), "username": np.array(["userc"], dtype=object)
+    })
+    rows = db.execute("SELECT * FROM users WHERE logins = 0")
+    assert len(rows) == 13 and all(row["logins"] == 0 for row in rows), rows
+    
+    # clear_caches also drops the predicates each table compiled
+    users = db.tables["users"]
+    assert users._compiled_conditions
+    db.clear_caches()
+    assert not users._compiled_conditions and not db.tables["orders"]._compiled_conditions
+    assert len(by_age.execute((25,))) == 6
+    print("Query caches: OK")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Run the PyFlareDB feature tests and benchmark")
+    parser.add_argument(
+        "--seed", type=lambda value: int(value, 0), default=DEFAULT_SEED,
+        help="seed of the test data generators (default: %(default)#x)"
+    )
+    args = parser.parse_args()
     try:
-        test_database_features()
+        test_parameter_binding()
+        test_query_caches()
+        test_database_features(args.seed)
     except Exception as e:
         print(f"Test failed: {e}")
         raise e